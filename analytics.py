@@ -0,0 +1,76 @@
+# Staff-relative stat analytics (percentiles, z-scores, ranks) per data version
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from data_cache import LRUCache
+from players import get_registry
+from sheets import PLAYER_NAME_COLUMNS, data_version, find_player_name_column, is_player_name, numeric_frame
+
+# Higher is better stats (green when high)
+HIGHER_BETTER = ['K%', 'K', 'Whiff%', 'Plus%', 'TPLUS%', 'FPS%', 'IP', 'K:BB', 'K:F$', 'k/9', 'Ahead%', 'E+A%']
+
+# Lower is better stats (green when low)
+LOWER_BETTER = ['ERA', 'WHIP', 'FWHIP', 'BB%', 'BAA', 'BACON', 'ER', 'BB', 'HBP', 'H', 'bb/9', 'h/9']
+
+# Matrices are indexed like the sheet frame (player rows only) with one column per numeric stat.
+# percentiles: 0-100, 100 = highest value on the staff
+# performance: 0-100, 100 = best on the staff (percentiles flipped for lower-is-better stats)
+# zscores: standard deviations from the staff mean
+# ranks: 1 = best on the staff (highest value for stats without a direction)
+StaffAnalytics = namedtuple("StaffAnalytics", ["percentiles", "performance", "zscores", "ranks", "highest", "lowest"])
+
+analytics_cache = LRUCache(maxsize=8)
+
+
+def stat_direction(stat):
+    """+1 when higher is better, -1 when lower is better, 0 when neither."""
+    if stat in HIGHER_BETTER:
+        return 1
+    if stat in LOWER_BETTER:
+        return -1
+    return 0
+
+
+def player_rows(data_frame):
+    """Boolean mask of real player rows (total rows and blanks excluded)."""
+    name_col = find_player_name_column(data_frame)
+    if name_col is None:
+        return np.ones(len(data_frame), dtype=bool)
+    return data_frame[name_col].map(is_player_name).to_numpy(dtype=bool)
+
+
+def compute_analytics(data_frame):
+    """Rank every player's numeric stats against the staff, all columns at once."""
+    numeric = numeric_frame(data_frame)
+    numeric = numeric.drop(columns=[col for col in PLAYER_NAME_COLUMNS if col in numeric.columns])
+    numeric = numeric[player_rows(data_frame)].dropna(axis=1, how='all')
+    signs = pd.Series([stat_direction(stat) or 1 for stat in numeric.columns], index=numeric.columns)
+    oriented = numeric * signs
+    std = numeric.std(ddof=0).replace(0, np.nan)
+    return StaffAnalytics(
+        percentiles=numeric.rank(pct=True) * 100,
+        performance=oriented.rank(pct=True) * 100,
+        zscores=(numeric - numeric.mean()) / std,
+        ranks=oriented.rank(ascending=False, method='min'),
+        highest=numeric.idxmax(),
+        lowest=numeric.idxmin(),
+    )
+
+
+def get_analytics(data_frame):
+    """Return the StaffAnalytics for this data version, computing it on first use."""
+    return analytics_cache.get_or_compute(data_version(data_frame), lambda: compute_analytics(data_frame))
+
+
+def player_percentiles(data_frame, player_name):
+    """Return {stat: percentile} for one player, or None if the player is not ranked."""
+    position = get_registry(data_frame).find(player_name)
+    if position is None:
+        return None
+    percentiles = get_analytics(data_frame).percentiles
+    label = data_frame.index[position]
+    if label not in percentiles.index:
+        return None
+    return {stat: float(value) for stat, value in percentiles.loc[label].items() if not np.isnan(value)}
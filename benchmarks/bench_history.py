@@ -0,0 +1,108 @@
+"""Trend history benchmark on synthetic seasons.
+
+Appends one weekly snapshot per week of several seasons for a staff of
+random-walk pitchers, then times the queries the Trends chart and analysis
+code make: one stat for the staff over a window, a few stats for one player
+over everything, and the full cube. Reports append cost, query times and the
+database size.
+
+Usage: python benchmarks/bench_history.py [--seasons 5] [--players 30] [--stats 40] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import history  # noqa: E402  pylint: disable=wrong-import-position
+
+WEEKS_PER_SEASON = 20  # February to June
+SEASON_START = datetime(2021, 2, 1, 12, tzinfo=timezone.utc)
+
+
+def synthetic_seasons(seasons, players, stats, seed=0):
+    """Yield (fetched_at, frame) for every weekly snapshot, with a total row like the real sheet."""
+    rng = np.random.default_rng(seed)
+    names = [f"Pitcher {i:03d}" for i in range(players)] + ["Staff Total:"]
+    stat_names = [f"Stat {j:02d}" for j in range(stats)]
+    for season in range(seasons):
+        values = rng.uniform(1, 50, size=(players + 1, stats))
+        for week in range(WEEKS_PER_SEASON):
+            values = values + rng.normal(0, 1, size=values.shape)
+            frame = pd.DataFrame(values.round(2), columns=stat_names)
+            frame.insert(0, "Column_B", names)
+            yield SEASON_START.replace(year=SEASON_START.year + season) + timedelta(weeks=week), frame
+
+
+def timed(function, repeat):
+    """Median wall time of function() in milliseconds, and its last result."""
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark trend history appends and queries.")
+    parser.add_argument("--seasons", type=int, default=5)
+    parser.add_argument("--players", type=int, default=30)
+    parser.add_argument("--stats", type=int, default=40)
+    parser.add_argument("--window-weeks", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.sqlite3")
+        store = history.HistoryStore(path)
+        append_times = []
+        for fetched_at, frame in synthetic_seasons(args.seasons, args.players, args.stats):
+            start = time.perf_counter()
+            store.append(frame, fetched_at)
+            append_times.append((time.perf_counter() - start) * 1000)
+        one_stat = "Stat 00"
+        one_player = "Pitcher 000"
+        queries = {
+            f"1 stat, staff, last {args.window_weeks} weeks":
+                lambda: store.recent(args.window_weeks, stats=[one_stat]),
+            f"1 stat, staff, last {args.window_weeks} weeks (frame)":
+                lambda: history.trend_frame(store.recent(args.window_weeks, stats=[one_stat]), one_stat),
+            "5 stats, 1 player, all seasons":
+                lambda: store.query(players=[one_player], stats=[f"Stat {j:02d}" for j in range(5)]),
+            "full cube": store.query,
+        }
+        results = {
+            "snapshots": len(append_times),
+            "values": len(store),
+            "db_kb": round(os.path.getsize(path) / 1024, 1),
+            "append_ms": round(statistics.median(append_times), 2),
+            "queries": {},
+        }
+        for label, query in queries.items():
+            elapsed, result = timed(query, args.repeat)
+            # Cubes and frames both expose their array as .values
+            results["queries"][label] = {"ms": round(elapsed, 2), "shape": list(result.values.shape)}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{results['snapshots']} weekly snapshots, {results['values']} values, {results['db_kb']} KB on disk")
+    print(f"append (median): {results['append_ms']:.2f} ms")
+    for label, query in results["queries"].items():
+        print(f"{label:<45} {query['ms']:>9.2f} ms  shape {tuple(query['shape'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
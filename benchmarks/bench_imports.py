@@ -0,0 +1,101 @@
+"""Import-time benchmark for the dashboard's cold start.
+
+Imports app.py's startup modules, then each page module, in fresh
+interpreters under ``python -X importtime`` and reports what every step costs,
+so regressions (e.g. a heavy library creeping back into app.py's top-level
+imports) show up as numbers we can track.
+
+Usage: python benchmarks/bench_imports.py [--repeat 5] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What app.py imports before the first element is drawn
+STARTUP_MODULES = ["streamlit", "dotenv", "data_cache", "players", "refresh_daemon", "views.layout"]
+# What each page adds the first time it is shown
+PAGE_MODULES = {
+    "overview page": "views.overview",
+    "charts page": "views.interactive_charts",
+    "player page": "views.player",
+}
+# Slow libraries that only the pages that need them should load
+HEAVY_PACKAGES = {"plotly", "openai", "googleapiclient"}
+
+
+def import_times(modules):
+    """Import modules in order in a fresh interpreter.
+
+    Returns {module: (cumulative microseconds, names of the modules it loaded)}.
+    """
+    statement = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times, nested = {}, []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, raw_name = line[len("import time:"):].split("|")
+        name = raw_name.strip()
+        # Children are printed before their parent; top-level names have one leading space
+        if len(raw_name) - len(raw_name.lstrip()) > 1:
+            nested.append(name)
+            continue
+        times[name] = (int(cumulative), nested + [name])
+        nested = []
+    return times
+
+
+def measure(page_module, repeat):
+    """Median startup and page import times (ms) plus the modules each loaded."""
+    runs = [import_times(STARTUP_MODULES + [page_module]) for _ in range(repeat)]
+    startup_ms = statistics.median(
+        sum(run[module][0] for module in STARTUP_MODULES if module in run) for run in runs
+    ) / 1000
+    page_ms = statistics.median(run.get(page_module, (0, []))[0] for run in runs) / 1000
+    startup_loaded = [
+        name for module in STARTUP_MODULES if module != "streamlit"  # Streamlit pulls in plotly itself
+        for name in runs[0].get(module, (0, []))[1]
+    ]
+    page_loaded = runs[0].get(page_module, (0, []))[1]
+    return startup_ms, page_ms, startup_loaded, page_loaded
+
+
+def heavy(loaded):
+    return sorted({name.split(".")[0] for name in loaded} & HEAVY_PACKAGES)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args(argv)
+
+    results, startup = {}, []
+    for label, module in PAGE_MODULES.items():
+        startup_ms, page_ms, startup_loaded, page_loaded = measure(module, args.repeat)
+        startup.append(startup_ms)
+        results[label] = {"ms": page_ms, "heavy_packages": heavy(page_loaded)}
+    results = {
+        "startup": {"ms": statistics.median(startup), "heavy_packages": heavy(startup_loaded)},
+        **results,
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    for label, result in results.items():
+        packages = ", ".join(result["heavy_packages"]) or "none"
+        print(f"{label:>14}: {result['ms']:8.1f} ms   heavy packages: {packages}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+# Chart data shared by every session of the Interactive Charts page
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+import history
+from analytics import stat_direction
+from data_cache import LRUCache
+from history import trend_frame
+from sheets import PLAYER_NAME_COLUMNS, data_version, find_player_name_column, numeric_frame
+
+# numeric: float64 stat columns, plottable: columns with any numeric value, names: player labels
+ChartData = namedtuple("ChartData", ["numeric", "plottable", "names", "name_col"])
+
+TRENDS = "Trends"  # Y-axis stat over time, read from the refresh history (see history.py)
+CHART_TYPES = ["Scatter Plot", "Bar Chart", "Line Chart", TRENDS]
+TREND_WEEKS = [4, 8, 12, 26, 52]
+DEFAULT_TREND_WEEKS = 12
+BAR_CHART_MAX_PLAYERS = 15  # Limit bar charts to the first 15 players for readability
+
+# NJIT colors (navy and red), registered once and layered on the default template
+NJIT_TEMPLATE = "njit"
+pio.templates[NJIT_TEMPLATE] = go.layout.Template(layout={
+    "plot_bgcolor": 'rgba(30, 64, 175, 0.1)',  # Light navy background
+    "paper_bgcolor": 'rgba(0,0,0,0)',
+    "font": {"color": 'white'},
+    "title": {"font": {"color": '#dc2626', "size": 20}},
+    "colorway": ['#dc2626'],  # NJIT red
+})
+FIGURE_TEMPLATE = f"plotly+{NJIT_TEMPLATE}"
+
+chart_data_cache = LRUCache(maxsize=8)
+# Serialized figures keyed by (data version, x, y, chart type, filters)
+figure_cache = LRUCache(maxsize=64)
+# History cubes keyed by (data version, stat, players, weeks); history only grows when the data changes
+trend_cache = LRUCache(maxsize=16)
+
+
+def build_chart_data(data):
+    """Convert every stat column to numbers once and list the plottable ones."""
+    numeric = numeric_frame(data)
+    plottable = [
+        col for col in numeric.columns
+        if col not in PLAYER_NAME_COLUMNS and numeric[col].notna().any()
+    ]
+    name_col = find_player_name_column(data)
+    names = data[name_col].astype(str) if name_col else None
+    return ChartData(numeric, plottable, names, name_col)
+
+
+def get_chart_data(data):
+    """Return the ChartData for this data version, building it on first use."""
+    return chart_data_cache.get_or_compute(data_version(data), lambda: build_chart_data(data))
+
+
+def plot_frame(chart_data, x_axis, y_axis):
+    """Return just the chosen axes (plus player names) for rows where both are numeric."""
+    x_values = chart_data.numeric[x_axis]
+    y_values = chart_data.numeric[y_axis]
+    mask = x_values.notna() & y_values.notna()
+    columns = {x_axis: x_values[mask], y_axis: y_values[mask]}
+    if chart_data.name_col:
+        columns[chart_data.name_col] = chart_data.names[mask]
+    return pd.DataFrame(columns)
+
+
+def build_figure(plot_data, x_axis, y_axis, chart_type, name_col=None):
+    """Build a Plotly figure for the chosen axes using the NJIT template."""
+    if chart_type == "Scatter Plot":
+        return px.scatter(
+            plot_data, x=x_axis, y=y_axis, hover_name=name_col,
+            title=f"{x_axis} vs {y_axis}", template=FIGURE_TEMPLATE,
+        )
+    if chart_type == "Bar Chart":
+        fig = px.bar(
+            plot_data.head(BAR_CHART_MAX_PLAYERS),
+            x=name_col if name_col else plot_data.head(BAR_CHART_MAX_PLAYERS).index,
+            y=y_axis, hover_name=name_col,
+            title=f"{y_axis} by Player", template=FIGURE_TEMPLATE,
+        )
+        fig.update_xaxes(tickangle=45)
+        return fig
+    if chart_type == "Line Chart":
+        return px.line(
+            plot_data, x=x_axis, y=y_axis, hover_name=name_col,
+            title=f"{x_axis} vs {y_axis} Trend", template=FIGURE_TEMPLATE,
+        )
+    raise ValueError(f"Unknown chart type: {chart_type}")
+
+
+def get_figure_json(data, x_axis, y_axis, chart_type, filters=()):
+    """Return the serialized figure for these parameters, building it on a cache miss.
+
+    filters is a hashable tuple of extra options that change the figure; it is
+    part of the cache key.
+    """
+    key = (data_version(data), x_axis, y_axis, chart_type, filters)
+
+    def build():
+        chart_data = get_chart_data(data)
+        plot_data = plot_frame(chart_data, x_axis, y_axis)
+        return build_figure(plot_data, x_axis, y_axis, chart_type, chart_data.name_col).to_json()
+
+    return figure_cache.get_or_compute(key, build)
+
+
+def get_trend_cube(data, stat, players=(), weeks=DEFAULT_TREND_WEEKS):
+    """Return the history cube of one stat for the last `weeks` weeks (every player when players is empty)."""
+    key = (data_version(data), stat, tuple(players), weeks)
+    return trend_cache.get_or_compute(
+        key, lambda: history.history_store.recent(weeks, players=list(players) or None, stats=[stat])
+    )
+
+
+def trend_changes(cube, stat):
+    """Change in a stat from each player's first to last value in the window, best first."""
+    frame = trend_frame(cube, stat)
+    if frame.empty:
+        return pd.Series(dtype=float)
+    changes = frame.ffill().iloc[-1] - frame.bfill().iloc[0]
+    return changes.sort_values(ascending=stat_direction(stat) < 0)
+
+
+def build_trend_figure(cube, stat):
+    """Line chart of one stat over the snapshot dates, one line per player."""
+    frame = trend_frame(cube, stat)
+    fig = px.line(
+        frame, x=frame.index, y=list(frame.columns), markers=True,
+        title=f"{stat} Over Time", template=FIGURE_TEMPLATE,
+    )
+    fig.update_layout(xaxis_title="Snapshot date", yaxis_title=stat, legend_title_text="Player")
+    return fig
+
+
+def get_trend_figure_json(data, stat, players=(), weeks=DEFAULT_TREND_WEEKS):
+    """Return the serialized Trends figure, or None when the history has no values for it."""
+    key = (data_version(data), None, stat, TRENDS, (tuple(players), weeks))
+
+    def build():
+        cube = get_trend_cube(data, stat, players, weeks)
+        if not cube.values.size or np.isnan(cube.values).all():
+            return None
+        return build_trend_figure(cube, stat).to_json()
+
+    return figure_cache.get_or_compute(key, build)
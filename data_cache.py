@@ -0,0 +1,299 @@
+# Process-wide cache for sheet data shared by every Streamlit session
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import sheets
+from snapshots import SNAPSHOT_DIR, SnapshotStore
+
+DEFAULT_TTL_SECONDS = 300
+# Minimum gap between background refresh attempts after a failed fetch
+RETRY_AFTER_SECONDS = 30
+
+
+snapshot_store = SnapshotStore(os.getenv("SNAPSHOT_DIR", SNAPSHOT_DIR))
+_seeded = False
+_seed_lock = threading.Lock()
+
+
+def offline_mode():
+    """True when OFFLINE_MODE is set, i.e. serve only from local snapshots."""
+    return os.getenv("OFFLINE_MODE", "").strip().lower() in ("1", "true", "yes")
+
+
+def _load_sheet():
+    """Default loader: pull the dashboard tab and snapshot it locally."""
+    if offline_mode():
+        data, _ = snapshot_store.load_latest()
+        return data
+    data = sheets.fetch_sheet_data()
+    if data is not None:
+        try:
+            snapshot_store.save(data)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.error(f"Could not save sheet snapshot: {e}")
+    return data
+
+
+class SheetDataCache:
+    """TTL cache in front of the sheet loader.
+
+    Concurrent callers share a single in-flight fetch, and once data has been
+    loaded an expired entry keeps being served while a background thread
+    revalidates it.
+    """
+
+    def __init__(self, loader=_load_sheet, ttl_seconds=DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        self.loader = loader
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data = None
+        self._loaded_at = None
+        self._last_attempt = None
+        self._inflight = None
+        self.generation = 0  # Bumped whenever a newly loaded frame is swapped in
+
+    def get(self):
+        """Return cached data, fetching or revalidating it as needed."""
+        with self._lock:
+            if self._data is not None:
+                if self._is_expired() and self._can_retry():
+                    self._start_background_refresh()
+                return self._data
+            event, owner = self._claim_fetch()
+        if owner:
+            self._run_fetch(event)
+        else:
+            event.wait()
+        with self._lock:
+            return self._data
+
+    def peek(self):
+        """Return the cached data as is (possibly None) without fetching."""
+        with self._lock:
+            return self._data
+
+    def refresh(self):
+        """Fetch now, or join a fetch already in flight; return the cached data."""
+        with self._lock:
+            event, owner = self._claim_fetch()
+        if owner:
+            self._run_fetch(event)
+        else:
+            event.wait()
+        return self.peek()
+
+    def is_refreshing(self):
+        """True while a fetch is in flight."""
+        with self._lock:
+            return self._inflight is not None
+
+    def seed(self, data):
+        """Prime an empty cache with already-stale data (e.g. from a snapshot).
+
+        The next get() returns it immediately and revalidates in the background.
+        """
+        with self._lock:
+            if self._data is None and data is not None:
+                self._data = data
+                self._loaded_at = self._clock() - self.ttl_seconds
+                self.generation += 1
+
+    def invalidate(self):
+        """Drop cached data so the next get() blocks on a fresh fetch."""
+        with self._lock:
+            logging.info("Sheet data cache invalidated.")
+            self._data = None
+            self._loaded_at = None
+            self._last_attempt = None
+
+    def age(self):
+        """Seconds since the cached data was loaded, or None when empty."""
+        with self._lock:
+            if self._loaded_at is None:
+                return None
+            return self._clock() - self._loaded_at
+
+    def _is_expired(self):
+        return self._clock() - self._loaded_at >= self.ttl_seconds
+
+    def _can_retry(self):
+        if self._inflight is not None:
+            return False
+        if self._last_attempt is None or self._last_attempt <= self._loaded_at:
+            return True
+        return self._clock() - self._last_attempt >= RETRY_AFTER_SECONDS
+
+    def _claim_fetch(self):
+        """Join the in-flight fetch or register a new one (lock must be held)."""
+        if self._inflight is not None:
+            return self._inflight, False
+        self._inflight = threading.Event()
+        self._last_attempt = self._clock()
+        return self._inflight, True
+
+    def _start_background_refresh(self):
+        event, _ = self._claim_fetch()
+        logging.info("Serving stale sheet data while refreshing in the background.")
+        threading.Thread(target=self._run_fetch, args=(event,), daemon=True).start()
+
+    def _run_fetch(self, event):
+        try:
+            data = self.loader()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.error(f"Sheet data loader failed: {e}")
+            data = None
+        with self._lock:
+            if data is not None:
+                if data is not self._data:
+                    self.generation += 1
+                self._data = data
+                self._loaded_at = self._clock()
+            self._inflight = None
+        event.set()
+
+
+class LRUCache:
+    """Small thread-safe LRU for artifacts derived from a data version."""
+
+    def __init__(self, maxsize=8):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, calling compute() on a miss."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+        value = compute()
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class BackgroundLoader:
+    """Process-wide daemon thread that keeps a SheetDataCache fresh.
+
+    The loader fetches as soon as it starts and then every interval_seconds,
+    or at the times of a schedule (anything with next_after(datetime), see
+    refresh_daemon), and immediately when triggered. Page renders read the
+    last loaded data and never wait on Google.
+    """
+
+    def __init__(self, cache, interval_seconds=DEFAULT_TTL_SECONDS, schedule=None):
+        self.cache = cache
+        self.interval_seconds = interval_seconds
+        self.schedule = schedule
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the loader thread unless it is already running."""
+        with self._lock:
+            if self.is_running():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sheet-loader", daemon=True)
+            self._thread.start()
+        logging.info(f"Background sheet loader started ({self.schedule or f'every {self.interval_seconds:.0f}s'}).")
+
+    def trigger(self):
+        """Ask the loader to refresh now instead of at the next scheduled time."""
+        self._wake.set()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            self.cache.refresh()
+            self._wake.wait(self._seconds_until_next())
+
+    def _seconds_until_next(self):
+        if self.schedule is None:
+            return self.interval_seconds
+        now = datetime.now()
+        return max(0.0, (self.schedule.next_after(now) - now).total_seconds())
+
+
+sheet_cache = SheetDataCache()
+sheet_loader = BackgroundLoader(sheet_cache)
+
+
+def _seed_from_snapshot():
+    """Serve the latest local snapshot on cold start instead of waiting on Google."""
+    global _seeded  # pylint: disable=global-statement
+    with _seed_lock:
+        if _seeded:
+            return
+        _seeded = True
+        data, fetched_at = snapshot_store.load_latest()
+    if data is not None:
+        logging.info(f"Seeding sheet data cache from snapshot taken {fetched_at.isoformat()}")
+        sheet_cache.seed(data)
+
+
+def get_sheet_data(ttl_seconds=None):
+    """Return the shared sheet DataFrame, or None if it could not be loaded."""
+    if ttl_seconds is not None:
+        sheet_cache.ttl_seconds = ttl_seconds
+    _seed_from_snapshot()
+    return sheet_cache.get()
+
+
+def start_background_loader(interval_seconds=None):
+    """Start the process-wide loader (idempotent) after seeding from the latest snapshot."""
+    if interval_seconds is not None:
+        sheet_loader.interval_seconds = interval_seconds
+    _seed_from_snapshot()
+    sheet_loader.start()
+
+
+def current_sheet_data():
+    """Return the last loaded sheet data without touching Google.
+
+    Only when nothing has been loaded yet (no snapshot, first fetch still
+    running) does this wait, joining the loader's fetch.
+    """
+    _seed_from_snapshot()
+    data = sheet_cache.peek()
+    return data if data is not None else sheet_cache.get()
+
+
+def request_refresh():
+    """Refresh in the background when the loader runs, otherwise drop the cache."""
+    if sheet_loader.is_running():
+        sheet_loader.trigger()
+    else:
+        invalidate_sheet_data()
+
+
+def invalidate_sheet_data():
+    """Force the next get_sheet_data() call to refetch from Google Sheets."""
+    sheet_cache.invalidate()
@@ -0,0 +1,85 @@
+# Vectorized conditional formatting for the Team Overview table
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from analytics import HIGHER_BETTER, LOWER_BETTER, get_analytics
+from data_cache import LRUCache
+from sheets import PLAYER_NAME_COLUMNS, data_version, numeric_frame, stat_formatters
+
+GREEN = 'color: #22c55e; font-weight: bold;'  # Excellent
+YELLOW = 'color: #eab308; font-weight: bold;'  # Average/Good
+RED = 'color: #ef4444; font-weight: bold;'  # Needs improvement
+BLUE = 'color: #60a5fa; font-weight: normal;'  # Other stats
+GRAY = 'color: #e5e7eb; font-weight: normal;'  # Non-numeric values
+
+# Judged stats are colored by the player's standing on the staff: top 30% green, bottom 40% red
+GREEN_PERCENTILE = 70
+YELLOW_PERCENTILE = 40
+
+# Rate stats without a direction in analytics.py, ranked highest first like any undirected stat.
+# Their typical ranges differ too much (CSW 25-35%, S% 60-70%) for one absolute band.
+PERCENTAGE_STATS = ['S%', 'FB S%', 'OS S%', 'FB CSW', 'OS CSW', 'SL CSW', 'CH/SPL CSW', 'CB CSW', 'CT CSW',
+                    'FB%', 'Out%', 'Out% RHB', 'Out% LHB', 'ZONE%', 'Swing%', 'FRB%', 'Early%']
+
+
+def staff_relative(values, performance):
+    # Rows without a standing (e.g. 'Staff Total:') are not judged
+    colors = np.select([performance >= GREEN_PERCENTILE, performance >= YELLOW_PERCENTILE], [GREEN, YELLOW], RED)
+    return np.where(np.isnan(performance), BLUE, colors)
+
+
+def other_stat(values, _performance):
+    return np.full(values.shape, BLUE, dtype=object)
+
+
+COLUMN_RULES = {
+    **{col: staff_relative for col in PERCENTAGE_STATS},
+    **{col: staff_relative for col in LOWER_BETTER},
+    **{col: staff_relative for col in HIGHER_BETTER},
+}
+
+# CSS matrices and formatters of recently rendered data versions
+overview_cache = LRUCache(maxsize=8)
+
+
+@lru_cache(maxsize=32)
+def compile_rules(columns):
+    """Group a tuple of column names by rule: {rule: [column positions]}."""
+    grouped = {}
+    for position, col in enumerate(columns):
+        if col in PLAYER_NAME_COLUMNS:
+            continue  # Name columns are left unstyled
+        grouped.setdefault(COLUMN_RULES.get(col, other_stat), []).append(position)
+    return grouped
+
+
+def cell_styles(data_frame):
+    """Compute the CSS for every cell at once, one np.select per rule.
+
+    Rules read each cell's value and its precomputed staff standing
+    (analytics performance percentile, NaN for non-player rows).
+    """
+    values = numeric_frame(data_frame).to_numpy()
+    performance = get_analytics(data_frame).performance.reindex(
+        index=data_frame.index, columns=data_frame.columns
+    ).to_numpy(dtype=float)
+    css = np.full(data_frame.shape, '', dtype=object)
+    for rule, positions in compile_rules(tuple(data_frame.columns)).items():
+        block = values[:, positions]
+        css[:, positions] = np.where(np.isnan(block), GRAY, rule(block, performance[:, positions]))
+    return pd.DataFrame(css, index=data_frame.index, columns=data_frame.columns)
+
+
+def style_dataframe(data_frame):
+    """Return a Styler with conditional colors applied in a single apply call.
+
+    The CSS matrix and formatters are cached per data version, so reruns on
+    unchanged data only wrap the precomputed result.
+    """
+    styles, formatters = overview_cache.get_or_compute(
+        data_version(data_frame),
+        lambda: (cell_styles(data_frame), stat_formatters(data_frame)),
+    )
+    return data_frame.style.apply(lambda _: styles, axis=None).format(formatters, na_rep='')
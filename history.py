@@ -0,0 +1,225 @@
+# Historical store of sheet refreshes for trend charts
+"""Every validated refresh is appended here, one snapshot per day.
+
+Values live in one long SQLite table keyed by (stat, day, player), with stat
+and player names interned as integer ids; a season of weekly snapshots for a
+30-pitcher staff takes about 1 MB. The primary key is also the per-stat index:
+reading a handful of stats over a window of weeks is one range scan per stat.
+query() returns the values as a player x date x stat cube.
+"""
+import logging
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+from contextlib import closing
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from players import normalize_name, normalize_names
+from sheets import PLAYER_NAME_COLUMNS, find_player_name_column, frame_fingerprint, is_player_name, numeric_frame
+
+HISTORY_PATH = "history.sqlite3"
+
+# values: float64 array shaped (players, dates, stats), NaN where a player had no value that day
+# players: normalized player keys, names: display names, dates: DatetimeIndex, stats: stat names
+TrendCube = namedtuple("TrendCube", ["values", "players", "names", "dates", "stats"])
+
+
+def stat_rows(data_frame):
+    """Return the frame's player stats as a long frame of (player, name, stat, value)."""
+    name_col = find_player_name_column(data_frame)
+    if name_col is None:
+        return pd.DataFrame(columns=["player", "name", "stat", "value"])
+    names = data_frame[name_col]
+    mask = names.map(is_player_name).to_numpy(dtype=bool)
+    numeric = numeric_frame(data_frame)
+    numeric = numeric.drop(columns=[col for col in PLAYER_NAME_COLUMNS if col in numeric.columns])[mask]
+    keys = normalize_names(names[mask])
+    # A player listed twice keeps the first row, as in the player registry
+    first = ~keys.duplicated().to_numpy()
+    numeric, keys = numeric[first], keys[first]
+    display = names[mask][first].astype(str).str.strip()
+    numeric.index = pd.MultiIndex.from_arrays([keys.to_numpy(), display.to_numpy()], names=["player", "name"])
+    numeric.columns.name = "stat"
+    return numeric.stack().dropna().rename("value").reset_index()
+
+
+class HistoryStore:
+    """SQLite long table of stat values per (stat, snapshot day, player).
+
+    A day holds the last refresh made on it, and a refresh whose fingerprint
+    matches the latest snapshot is skipped, so frequent refreshes of a sheet
+    updated weekly still record one snapshot per week.
+    """
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = str(path)
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def append(self, data_frame, fetched_at=None):
+        """Record the frame's player stats under its snapshot date; return the rows written."""
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+        day = fetched_at.date().toordinal()
+        fingerprint = frame_fingerprint(data_frame)
+        long = stat_rows(data_frame)
+        if long.empty:
+            return 0
+        with closing(self._connect()) as conn, conn:
+            # An unchanged sheet is not recorded again, on the same day or any later one
+            row = conn.execute("SELECT fingerprint FROM snapshots ORDER BY day DESC LIMIT 1").fetchone()
+            if row is not None and row[0] == fingerprint:
+                return 0
+            stat_ids = self._intern(conn, "stats", long["stat"].unique())
+            player_ids = self._intern(conn, "players", long["player"].unique())
+            players = long.drop_duplicates("player")
+            conn.executemany(
+                "UPDATE players SET name = ? WHERE key = ?", zip(players["name"], players["player"])
+            )
+            # Values a later refresh on the same day no longer has must not linger
+            conn.execute("DELETE FROM stat_values WHERE day = ?", (day,))
+            conn.executemany(
+                "INSERT INTO stat_values (stat_id, day, player_id, value) VALUES (?, ?, ?, ?)",
+                zip(
+                    long["stat"].map(stat_ids).tolist(), [day] * len(long),
+                    long["player"].map(player_ids).tolist(), long["value"].tolist(),
+                ),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots (day, fetched_at, fingerprint) VALUES (?, ?, ?)",
+                (day, fetched_at.isoformat(), fingerprint),
+            )
+        logging.info(f"Recorded {len(long)} stat values for {date.fromordinal(day).isoformat()} in history")
+        return len(long)
+
+    def snapshot_dates(self):
+        """Dates with recorded data, oldest first."""
+        with closing(self._connect()) as conn:
+            return [date.fromordinal(day) for (day,) in conn.execute("SELECT day FROM snapshots ORDER BY day")]
+
+    def latest_date(self):
+        """Date of the newest snapshot, or None when the store is empty."""
+        with closing(self._connect()) as conn:
+            day = conn.execute("SELECT MAX(day) FROM snapshots").fetchone()[0]
+        return None if day is None else date.fromordinal(day)
+
+    def query(self, players=None, stats=None, start=None, end=None):
+        """Return the TrendCube for these players and stats between start and end (inclusive).
+
+        None selects every player, every stat, or an open end of the window.
+        Players and stats the store has never seen are left out; the player
+        and stat axes follow the requested order (by name and by first
+        appearance otherwise), and the date axis is ascending.
+        """
+        with closing(self._connect()) as conn:
+            player_table = self._table(conn, "SELECT id, key, name FROM players")
+            stat_table = self._table(conn, "SELECT id, key, key FROM stats")
+            if players is None:
+                player_keys = sorted(player_table, key=lambda key: player_table[key][1].lower())
+            else:
+                player_keys = [key for key in dict.fromkeys(map(normalize_name, players)) if key in player_table]
+            stat_names = list(stat_table) if stats is None else [s for s in dict.fromkeys(stats) if s in stat_table]
+            clauses, params = [], []
+            if stats is not None:
+                clauses.append(f"stat_id IN ({','.join('?' * len(stat_names))})")
+                params += [stat_table[name][0] for name in stat_names]
+            if players is not None:
+                clauses.append(f"player_id IN ({','.join('?' * len(player_keys))})")
+                params += [player_table[key][0] for key in player_keys]
+            if start is not None:
+                clauses.append("day >= ?")
+                params.append(start.toordinal())
+            if end is not None:
+                clauses.append("day <= ?")
+                params.append(end.toordinal())
+            where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+            rows = conn.execute(f"SELECT player_id, day, stat_id, value FROM stat_values{where}", params).fetchall()
+
+        values = np.array(rows, dtype=np.float64).reshape(-1, 4)
+        days, day_positions = np.unique(values[:, 1].astype(np.int64), return_inverse=True)
+        player_positions = self._positions([player_table[key][0] for key in player_keys], values[:, 0])
+        stat_positions = self._positions([stat_table[name][0] for name in stat_names], values[:, 2])
+        cube = np.full((len(player_keys), len(days), len(stat_names)), np.nan)
+        cube[player_positions, day_positions, stat_positions] = values[:, 3]
+        return TrendCube(
+            values=cube,
+            players=player_keys,
+            names=[player_table[key][1] for key in player_keys],
+            dates=pd.DatetimeIndex([date.fromordinal(int(day)) for day in days]),
+            stats=stat_names,
+        )
+
+    def recent(self, weeks, players=None, stats=None):
+        """Return the cube for the last `weeks` weeks up to the newest snapshot."""
+        end = self.latest_date()
+        if end is None:
+            return self.query(players, stats)
+        return self.query(players, stats, start=end - timedelta(weeks=weeks) + timedelta(days=1), end=end)
+
+    def clear(self):
+        with closing(self._connect()) as conn, conn:
+            for table in ("stat_values", "snapshots", "players", "stats"):
+                conn.execute(f"DELETE FROM {table}")
+
+    def __len__(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM stat_values").fetchone()[0]
+
+    @staticmethod
+    def _intern(conn, table, keys):
+        """Return {key: id} for keys, adding the ones the table does not have yet."""
+        conn.executemany(f"INSERT OR IGNORE INTO {table} (key) VALUES (?)", [(key,) for key in keys])
+        return dict(conn.execute(f"SELECT key, id FROM {table}").fetchall())
+
+    @staticmethod
+    def _table(conn, sql):
+        """Return {key: (id, label)} for a lookup table."""
+        return {key: (row_id, label) for row_id, key, label in conn.execute(sql)}
+
+    @staticmethod
+    def _positions(ids, column):
+        """Map an id column to positions along a cube axis."""
+        lookup = np.zeros(max(ids, default=0) + 1, dtype=np.int64)
+        lookup[ids] = np.arange(len(ids))
+        return lookup[column.astype(np.int64)]
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        with self._init_lock:
+            if not self._initialized:
+                with conn:
+                    conn.execute("CREATE TABLE IF NOT EXISTS stats (id INTEGER PRIMARY KEY, key TEXT UNIQUE)")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS players (id INTEGER PRIMARY KEY, key TEXT UNIQUE, name TEXT)"
+                    )
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS snapshots (day INTEGER PRIMARY KEY, fetched_at TEXT,"
+                        " fingerprint TEXT)"
+                    )
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS stat_values (stat_id INTEGER, day INTEGER, player_id INTEGER,"
+                        " value REAL, PRIMARY KEY (stat_id, day, player_id)) WITHOUT ROWID"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS stat_values_player ON stat_values (player_id, day)")
+                self._initialized = True
+        return conn
+
+
+def trend_frame(cube, stat):
+    """One stat from a cube as a date x player DataFrame (display names as columns)."""
+    values = cube.values[:, :, cube.stats.index(stat)]
+    return pd.DataFrame(values.T, index=cube.dates, columns=cube.names).dropna(axis=1, how="all")
+
+
+def backfill(store, snapshot_store):
+    """Append every saved sheet snapshot to the history; return the rows written."""
+    written = 0
+    for fetched_at, path in snapshot_store.list_snapshots():
+        written += store.append(snapshot_store.load(path), fetched_at)
+    return written
+
+
+history_store = HistoryStore(os.getenv("HISTORY_PATH", HISTORY_PATH))
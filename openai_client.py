@@ -0,0 +1,149 @@
+# Shared OpenAI clients with timeouts, retries and a circuit breaker
+import logging
+import os
+import random
+import threading
+import time
+
+import openai
+from openai import OpenAI
+
+CONNECT_TIMEOUT_SECONDS = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT_SECONDS = float(os.getenv("OPENAI_READ_TIMEOUT", "60"))
+MAX_ATTEMPTS = 3
+BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 30.0
+# Consecutive failed calls before the breaker opens, and how long it stays open
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 60.0
+
+# 429, 5xx, connection failures and timeouts are worth retrying
+RETRYABLE_ERRORS = (
+    openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling OpenAI while the circuit breaker is open."""
+
+
+def retry_delay(error, attempt, base=BACKOFF_SECONDS, cap=MAX_BACKOFF_SECONDS):
+    """Exponential backoff with jitter, honoring a Retry-After header when sent."""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(float(retry_after), cap)
+    except (TypeError, ValueError):
+        return min(base * 2 ** attempt, cap) * random.uniform(0.5, 1.0)
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures, then let one trial call through."""
+
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD,
+                 reset_seconds=BREAKER_RESET_SECONDS, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+
+    def allow_request(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._clock() - self._opened_at >= self.reset_seconds:
+                # Half-open: allow a trial call; a failure re-opens the breaker
+                self._opened_at = self._clock()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logging.warning("OpenAI circuit breaker opened after repeated failures.")
+                self._opened_at = self._clock()
+
+    @property
+    def is_open(self):
+        with self._lock:
+            return self._opened_at is not None
+
+
+class OpenAIClientManager:
+    """One long-lived OpenAI client (and HTTP connection pool) per API key.
+
+    Calls made through call() get connect/read timeouts, retries with
+    exponential backoff and jitter on 429/5xx, and a circuit breaker per
+    client so a degraded API fails fast instead of stalling every page.
+    """
+
+    def __init__(self, connect_timeout=CONNECT_TIMEOUT_SECONDS, read_timeout=READ_TIMEOUT_SECONDS,
+                 max_attempts=MAX_ATTEMPTS, sleep=time.sleep):
+        self.timeout = openai.Timeout(read_timeout, connect=connect_timeout)
+        self.max_attempts = max_attempts
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._breakers = {}
+
+    def get_client(self, api_key, base_url=None):
+        """Return the shared client for this key and endpoint, creating it once."""
+        key = (api_key, base_url)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                # Retries are handled by call() so they share the circuit breaker
+                client = OpenAI(api_key=api_key, base_url=base_url, timeout=self.timeout, max_retries=0)
+                self._clients[key] = client
+            return client
+
+    def breaker(self, api_key, base_url=None):
+        """Return the circuit breaker guarding this key and endpoint."""
+        with self._lock:
+            return self._breakers.setdefault((api_key, base_url), CircuitBreaker())
+
+    def call(self, api_key, request, base_url=None, on_retry=None):
+        """Run request(client) with retries, backoff and the circuit breaker.
+
+        on_retry(error, delay), when given, is called before each backoff; if
+        it returns True it has arranged the wait itself and call() does not sleep.
+        """
+        client = self.get_client(api_key, base_url)
+        breaker = self.breaker(api_key, base_url)
+        if not breaker.allow_request():
+            raise CircuitOpenError("OpenAI is temporarily unavailable; skipping request.")
+        for attempt in range(self.max_attempts):
+            try:
+                result = request(client)
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_attempts - 1:
+                    breaker.record_failure()
+                    raise
+                delay = retry_delay(e, attempt)
+                logging.warning(f"OpenAI request failed ({e.__class__.__name__}); retrying in {delay:.1f}s")
+                if on_retry is None or not on_retry(e, delay):
+                    self._sleep(delay)
+            else:
+                breaker.record_success()
+                return result
+        return None
+
+    def reset(self):
+        """Close every client and forget breaker state."""
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+            self._breakers.clear()
+
+
+openai_manager = OpenAIClientManager()
@@ -0,0 +1,134 @@
+# Player lookups over the loaded sheet, built once per data version
+import numpy as np
+import pandas as pd
+
+from data_cache import LRUCache
+from sheets import NON_PLAYER_NAMES, data_version, find_player_name_column
+
+registry_cache = LRUCache(maxsize=8)
+
+
+def normalize_name(name):
+    """Lookup key for a player name: case, colon and whitespace insensitive."""
+    return " ".join(str(name).replace(":", "").lower().split())
+
+
+def normalize_names(names):
+    """Vectorized normalize_name over a Series; missing values become ''."""
+    return (
+        names.astype("string")
+        .fillna("")
+        .str.replace(":", "", regex=False)
+        .str.lower()
+        .str.split()
+        .str.join(" ")
+    )
+
+
+class StatStore:
+    """Column-oriented stats shared by every Player view of one frame."""
+
+    def __init__(self, data_frame):
+        self.columns = list(data_frame.columns)
+        # .array keeps extension dtypes, so a nullable Int32 column with blanks still yields ints
+        self.arrays = {col: data_frame[col].array for col in self.columns}
+        self.size = len(data_frame)
+
+    def value(self, stat_name, row):
+        array = self.arrays.get(stat_name)
+        return None if array is None else array[row]
+
+    def row_dict(self, row):
+        return {col: self.arrays[col][row] for col in self.columns}
+
+
+class Player:
+    """Lightweight view of one row in a StatStore.
+
+    Only the store reference and row position are held per player; stats are
+    read from the shared column arrays on access.
+    """
+
+    __slots__ = ('store', 'row')
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    @classmethod
+    def from_stats(cls, stats):
+        """Build a standalone Player from a {stat: value} dict."""
+        return cls(StatStore(pd.DataFrame([stats])), 0)
+
+    @property
+    def stats(self):
+        return self.store.row_dict(self.row)
+
+    def get_stat(self, stat_name):
+        return self.store.value(stat_name, self.row)
+
+    def __getitem__(self, key):
+        return self.store.value(key, self.row)
+
+    def __getattr__(self, name):
+        # Only reached for names that are not slots, e.g. player.ERA
+        if name in Player.__slots__ or name not in self.store.arrays:
+            raise AttributeError(name)
+        return self.store.value(name, self.row)
+
+    def __repr__(self):
+        return f"Player({self.stats})"
+
+
+class PlayerRegistry:
+    """Hash maps from normalized player names to row positions in the frame.
+
+    Real players and total rows ('Staff Total:', ...) are kept apart, so
+    lookups never resolve a total row as a player and both are O(1).
+    """
+
+    def __init__(self, data_frame):
+        self.data = data_frame
+        self.store = StatStore(data_frame)
+        self.name_col = find_player_name_column(data_frame)
+        self.rows = {}
+        self.total_rows = {}
+        self.display_names = []
+        if self.name_col is None:
+            return
+        names = data_frame[self.name_col]
+        keys = normalize_names(names).to_numpy(dtype=object)
+        is_total = np.isin(keys, NON_PLAYER_NAMES)
+        positions = np.arange(len(keys))
+        # Reversed so the first row wins when a name appears twice
+        self.rows = dict(zip(keys[~is_total][::-1], positions[~is_total][::-1]))
+        self.total_rows = {key: pos for key, pos in zip(keys[is_total][::-1], positions[is_total][::-1]) if key}
+        self.display_names = names[~is_total].astype(str).str.strip().tolist()
+
+    def find(self, name):
+        """Row position of the named player, or None."""
+        return self.rows.get(normalize_name(name))
+
+    def find_total(self, name):
+        """Row position of a total row such as 'Staff Total:', or None."""
+        return self.total_rows.get(normalize_name(name))
+
+    def player(self, position):
+        """The Player at a row position."""
+        return Player(self.store, position)
+
+    def get(self, name):
+        """The named Player, or None."""
+        position = self.find(name)
+        return None if position is None else self.player(position)
+
+    def __contains__(self, name):
+        return self.find(name) is not None
+
+    def __len__(self):
+        return len(self.rows)
+
+
+def get_registry(data_frame):
+    """Return the PlayerRegistry for this frame, shared by every rerun and session."""
+    return registry_cache.get_or_compute(data_version(data_frame), lambda: PlayerRegistry(data_frame))
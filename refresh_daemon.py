@@ -0,0 +1,348 @@
+# Scheduled sheet refresh: fetch, validate, snapshot, record history, pre-warm, swap
+"""Refresh the sheet data on a schedule so request handling never waits on Google.
+
+Each refresh fetches the sheet, validates it, writes a snapshot, appends it to
+the trend history (history.py) and pre-warms the derived caches (player registry, styled overview, chart data, prompt
+percentiles, z-scores and ranks) before the new frame is swapped into the shared cache.
+
+The Streamlit app runs this in-process on its background loader. It can also
+run on its own, writing snapshots that an app started with OFFLINE_MODE=1
+picks up:
+
+    python -m refresh_daemon --schedule "0 6 * * 1"   # Mondays at 06:00
+    python -m refresh_daemon --schedule 15m
+    python -m refresh_daemon --once
+    python -m refresh_daemon --backfill-history   # Seed the history from snapshots/
+
+A sheet that suddenly loses most of its players is held back as partial
+until it is still the same SHRINK_CONFIRM_SECONDS later. While one is pending
+the refresh is retried every SHRINK_RETRY_SECONDS whatever the schedule, and
+--once keeps retrying within its run, so a weekly cron job confirms a roster
+cut within minutes of its run.
+"""
+import argparse
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+
+import data_cache
+import history
+import sheets
+from data_cache import DEFAULT_TTL_SECONDS, offline_mode, sheet_cache, sheet_loader, start_background_loader
+
+# Validation: a refresh is rejected (and the previous data kept) when it fails these
+MIN_PLAYERS = 1
+MIN_STAT_COLUMNS = 5
+# A new sheet with fewer than this share of the previous player count is treated as partial
+MIN_PLAYER_RATIO = 0.5
+# ...unless the same sheet is still there this long after it was first rejected (a real roster
+# change), or REFRESH_ALLOW_SHRINK=1 is set to accept it right away
+SHRINK_CONFIRM_SECONDS = 15 * 60
+# While such a sheet awaits confirmation, refreshes run at least this often whatever the schedule,
+# so a weekly cron job confirms a roster cut within minutes of its run rather than weeks later
+SHRINK_RETRY_SECONDS = 5 * 60
+
+_INTERVAL_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhd]?)$")
+_INTERVAL_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class IntervalSchedule:
+    """Run every fixed number of seconds."""
+
+    def __init__(self, seconds):
+        if seconds <= 0:
+            raise ValueError("Refresh interval must be positive")
+        self.seconds = seconds
+
+    def next_after(self, moment):
+        return moment + timedelta(seconds=self.seconds)
+
+    def __repr__(self):
+        return f"IntervalSchedule({self.seconds:g}s)"
+
+
+class CronSchedule:
+    """Five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields accept '*', numbers, ranges ('1-5'), lists ('0,30') and steps
+    ('*/15'). Day of week runs 0-7 with 0 and 7 both Sunday; as in cron, when
+    both day fields are restricted a day matching either one runs.
+    """
+
+    FIELDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        parsed = [self._parse_field(field, low, high) for field, (low, high) in zip(fields, self.FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse_field(field, low, high):
+        values = set()
+        for part in field.split(","):
+            span, _, step = part.partition("/")
+            step = int(step) if step else 1
+            if span == "*":
+                start, end = low, high
+            elif "-" in span:
+                start, end = (int(value) for value in span.split("-", 1))
+            else:
+                start = int(span)
+                end = high if step > 1 else start
+            if not low <= start <= end <= high or step < 1:
+                raise ValueError(f"Invalid cron field {field!r}")
+            values.update(range(start, end + 1, step))
+        return frozenset(values)
+
+    def _day_matches(self, moment):
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment):
+        """Return the first matching minute strictly after moment."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 4)  # Covers Feb 29 schedules
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+    def __repr__(self):
+        return f"CronSchedule({self.expression!r})"
+
+
+class ShrinkRetrySchedule:
+    """Wrap a schedule to retry sooner while a shrunken sheet awaits confirmation."""
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+
+    def next_after(self, moment):
+        next_run = self.schedule.next_after(moment)
+        if _rejected_shrink[0] is None:
+            return next_run
+        return min(next_run, moment + timedelta(seconds=SHRINK_RETRY_SECONDS))
+
+    def __repr__(self):
+        return repr(self.schedule)
+
+
+def parse_schedule(text):
+    """Parse '300', '15m', '6h' or '1d' as an interval, anything else as a cron expression."""
+    text = str(text).strip()
+    match = _INTERVAL_PATTERN.match(text)
+    if match:
+        return IntervalSchedule(float(match.group(1)) * _INTERVAL_UNITS[match.group(2)])
+    return CronSchedule(text)
+
+
+def default_schedule():
+    """REFRESH_SCHEDULE from the environment, falling back to SHEET_CACHE_TTL seconds."""
+    return parse_schedule(os.getenv("REFRESH_SCHEDULE") or os.getenv("SHEET_CACHE_TTL") or DEFAULT_TTL_SECONDS)
+
+
+def validate_sheet(data, previous=None):
+    """Return a list of problems that make this frame unfit to serve (empty when valid)."""
+    if data is None or data.empty:
+        return ["sheet is empty"]
+    name_col = sheets.find_player_name_column(data)
+    if name_col is None:
+        return ["no player name column"]
+    players = int(data[name_col].map(sheets.is_player_name).sum())
+    problems = []
+    if players < MIN_PLAYERS:
+        problems.append(f"only {players} player rows")
+    stat_columns = int(sheets.numeric_frame(data).notna().any().sum())
+    if stat_columns < MIN_STAT_COLUMNS:
+        problems.append(f"only {stat_columns} numeric stat columns")
+    if previous is not None and previous is not data:
+        previous_col = sheets.find_player_name_column(previous)
+        if previous_col is not None:
+            previous_players = int(previous[previous_col].map(sheets.is_player_name).sum())
+            if players < previous_players * MIN_PLAYER_RATIO:
+                problems.append(f"player count dropped from {previous_players} to {players}")
+    return problems
+
+
+def prewarm(data):
+    """Build the per-version artifacts pages read, so the first render after a swap is a cache hit."""
+    # Imported here: charts pulls in plotly, which the app keeps off its startup path
+    from analytics import get_analytics
+    from charts import CHART_TYPES, get_chart_data, get_figure_json
+    from formatting import style_dataframe
+    from players import get_registry
+
+    start = time.perf_counter()
+    get_registry(data)
+    style_dataframe(data)
+    get_analytics(data)
+    chart_data = get_chart_data(data)
+    if chart_data.plottable:
+        # The figure the Interactive Charts page shows for its default selections
+        first = chart_data.plottable[0]
+        get_figure_json(data, first, first, CHART_TYPES[0])
+    logging.info(f"Pre-warmed derived caches in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+_last_snapshot = None
+# Last frame this process accepted: what a standalone daemon, whose sheet_cache stays empty, compares against
+_last_accepted = None
+# (fingerprint, monotonic time first rejected) of a sheet rejected only for dropping players
+_rejected_shrink = (None, 0.0)
+_refresh_lock = threading.Lock()
+
+
+def allow_shrink():
+    """True when REFRESH_ALLOW_SHRINK is set, i.e. accept a large player-count drop immediately."""
+    return os.getenv("REFRESH_ALLOW_SHRINK", "").strip().lower() in ("1", "true", "yes")
+
+
+def _previous_frame():
+    """The frame a new sheet is validated against: served, last accepted, or latest snapshot."""
+    previous = sheet_cache.peek()
+    if previous is None:
+        previous = _last_accepted
+    if previous is None and not offline_mode():
+        previous, _ = data_cache.snapshot_store.load_latest()
+    return previous
+
+
+def _shrink_confirmed(data, now):
+    """Note a rejection of this shrunken sheet; True once it has persisted long enough."""
+    global _rejected_shrink  # pylint: disable=global-statement
+    fingerprint = sheets.frame_fingerprint(data)
+    if _rejected_shrink[0] != fingerprint:
+        _rejected_shrink = (fingerprint, now)
+    return allow_shrink() or now - _rejected_shrink[1] >= SHRINK_CONFIRM_SECONDS
+
+
+def refresh_sheet(clock=time.monotonic):
+    """Load, validate, snapshot and pre-warm the sheet; return the frame to serve.
+
+    Returns the currently served frame when nothing changed, and None when the
+    new data is rejected, in which case the cache keeps its previous data.
+    """
+    global _last_snapshot, _last_accepted, _rejected_shrink  # pylint: disable=global-statement
+    with _refresh_lock:
+        previous = _previous_frame()
+        if offline_mode():
+            snapshots = data_cache.snapshot_store.list_snapshots()
+            if not snapshots:
+                return None
+            path = snapshots[-1][1]
+            if path == _last_snapshot and previous is not None:
+                return previous
+            data = data_cache.snapshot_store.load(path)
+            _last_snapshot = path
+        else:
+            data = sheets.fetch_sheet_data()
+        problems = validate_sheet(data, previous)
+        if problems and validate_sheet(data):
+            _rejected_shrink = (None, 0.0)
+        elif problems and _shrink_confirmed(data, clock()):
+            # Only the player-count drop failed, and it has persisted: take it as a roster change
+            logging.warning(f"Accepting sheet refresh despite: {'; '.join(problems)}")
+            problems = []
+        if problems:
+            logging.error(f"Rejected sheet refresh: {'; '.join(problems)}")
+            return None
+        _rejected_shrink = (None, 0.0)
+        _last_accepted = data
+        if not offline_mode():
+            try:
+                data_cache.snapshot_store.save(data)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logging.error(f"Could not save sheet snapshot: {e}")
+            # The process that fetches records history; offline readers share its database
+            try:
+                history.history_store.append(data)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logging.error(f"Could not record sheet history: {e}")
+        try:
+            prewarm(data)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.error(f"Pre-warming derived caches failed: {e}")
+        return data
+
+
+def start_in_process(schedule=None):
+    """Run scheduled refreshes on the app's background loader (idempotent)."""
+    sheet_cache.loader = refresh_sheet
+    sheet_loader.schedule = ShrinkRetrySchedule(schedule or default_schedule())
+    start_background_loader()
+
+
+def run_forever(schedule, refresh=refresh_sheet, clock=datetime.now, sleep=time.sleep):
+    """Refresh now and then at every scheduled time, until interrupted."""
+    while True:
+        data = refresh()
+        logging.info(f"Refresh finished: {'ok' if data is not None else 'no data'}")
+        next_run = schedule.next_after(clock())
+        logging.info(f"Next refresh at {next_run.isoformat(timespec='minutes')}")
+        sleep(max(0.0, (next_run - clock()).total_seconds()))
+
+
+def refresh_once(refresh=refresh_sheet, sleep=time.sleep):
+    """Refresh, retrying a shrunken sheet until it is confirmed; return the frame or None.
+
+    A process started from cron for one refresh keeps no state between runs,
+    so the confirmation a roster cut needs has to happen within this run.
+    """
+    data = refresh()
+    for _ in range(int(SHRINK_CONFIRM_SECONDS // SHRINK_RETRY_SECONDS)):
+        if data is not None or _rejected_shrink[0] is None:
+            break
+        logging.info(f"Retrying the shrunken sheet in {SHRINK_RETRY_SECONDS:.0f}s")
+        sleep(SHRINK_RETRY_SECONDS)
+        data = refresh()
+    return data
+
+
+def main(argv=None):
+    """CLI: keep the sheet snapshots fresh on a schedule."""
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Refresh the sheet data on a schedule.")
+    parser.add_argument("--schedule", default=None,
+                        help="Interval ('300', '15m', '6h') or cron expression; defaults to REFRESH_SCHEDULE")
+    parser.add_argument("--once", action="store_true", help="Refresh once and exit")
+    parser.add_argument("--backfill-history", action="store_true",
+                        help="Append every saved snapshot to the trend history and exit")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    if args.backfill_history:
+        written = history.backfill(history.history_store, data_cache.snapshot_store)
+        logging.info(f"Backfilled {written} stat values into {history.history_store.path}")
+        return 0
+    schedule = parse_schedule(args.schedule) if args.schedule else default_schedule()
+    if args.once:
+        return 0 if refresh_once() is not None else 1
+    logging.info(f"Refresh daemon running with {schedule}")
+    try:
+        run_forever(ShrinkRetrySchedule(schedule))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
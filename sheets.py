@@ -7,60 +7,756 @@ logging.basicConfig(
     handlers=[logging.FileHandler("sheets.log"), logging.StreamHandler()]
 )
 
+import hashlib
+import json
+import re
+import threading
+import time
+import weakref
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 
 # Replace with your actual Google Sheets ID and range
 SHEET_ID = "1Wt2JsPwGqoqBOeatLCAQeKKoW6mt_ekm8MUZdXSJcjw"
 RANGE_NAME = "Dash!B1:BQ22"
 CREDENTIALS_FILE = "credentials.json"  # Place your credentials file in the project
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets.readonly",
+    "https://www.googleapis.com/auth/drive.metadata.readonly",
+]
+# Label columns created for the blank headers in B-G; the first present one holds player names
+PLAYER_NAME_COLUMNS = ['Column_B', 'Column_C', 'Column_D', 'Column_E', 'Column_F', 'Column_G']
+# Name-column values of summary rows that are not players (compared lowercased, without colons)
+NON_PLAYER_NAMES = ["staff total", "total", "team total", ""]
+# Ingest schema: columns needing special parsing; other stat columns (including "3:1" ratios)
+# are inferred from their cells
+# 5.1 / 5.2 mean 5 1/3 and 5 2/3 innings, but only when every value is written that way;
+# sheets that store decimal innings ('13.3', '123.33') keep them as plain floats
+INNINGS_COLUMNS = ['IP']
+NULL_TOKENS = ['', '-', '--', 'N/A', '#N/A', '#DIV/0!']
+# Display precision for ratio cells, and for frames ingested without recorded decimals
+RATIO_DECIMALS = 2
+DEFAULT_DECIMALS = 2
+DEFAULT_PERCENT_DECIMALS = 1
+HTTP_TIMEOUT_SECONDS = 30
+# Tabs taller than this are downloaded in row chunks of this size
+CHUNK_ROWS = 5000
+# Chunks held back while a column is still blank, before its kind is settled as text
+SCHEMA_CHUNKS = 4
+# How long discovered tab dimensions are trusted when Drive versions are unavailable
+GRID_TTL_SECONDS = 3600
+# Spreadsheets fetched in parallel by fetch_ranges (one batchGet each)
+FETCH_WORKERS = 4
 
 # Share sheet with baseball-stats-reader@statsdashwebsite.iam.gserviceaccount.com
 
+
+class SheetsClient:
+    """Long-lived, thread-safe holder for Google credentials and the Sheets service.
+
+    Credentials and the Sheets service are built once per process. Each thread
+    executes requests over its own authorized HTTP connection, which is reused
+    across calls, and the access token is only refreshed once it has expired.
+    """
+
+    def __init__(self, credentials_file=CREDENTIALS_FILE, scopes=None):
+        self.credentials_file = credentials_file
+        self.scopes = scopes or SCOPES
+        self.timings = {}
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._credentials = None
+        self._service = None
+        self._drive_service = None
+
+    def credentials(self):
+        """Return the service account credentials, loading them on first use."""
+        with self._lock:
+            if self._credentials is None:
+                from google.oauth2 import service_account  # Google client libraries load on first use
+                start = time.perf_counter()
+                self._credentials = service_account.Credentials.from_service_account_file(
+                    self.credentials_file, scopes=self.scopes
+                )
+                self._record("credentials", start)
+            return self._credentials
+
+    def service(self):
+        """Return the Sheets API service, building it from discovery on first use."""
+        with self._lock:
+            if self._service is None:
+                from googleapiclient.discovery import build
+                http = self._authorized_http()
+                start = time.perf_counter()
+                self._service = build("sheets", "v4", http=http, cache_discovery=False)
+                self._record("discovery", start)
+            return self._service
+
+    def execute(self, request):
+        """Execute a prepared API request on this thread's pooled connection."""
+        http = self._authorized_http()
+        self._ensure_token(http)
+        start = time.perf_counter()
+        result = request.execute(http=http)
+        self._record("request", start)
+        return result
+
+    def drive_service(self):
+        """Return the Drive API service used for cheap file metadata lookups."""
+        with self._lock:
+            if self._drive_service is None:
+                from googleapiclient.discovery import build
+                http = self._authorized_http()
+                start = time.perf_counter()
+                self._drive_service = build("drive", "v3", http=http, cache_discovery=False)
+                self._record("drive_discovery", start)
+            return self._drive_service
+
+    def get_values(self, spreadsheet_id, range_name):
+        """Return the raw values response for a single range."""
+        sheet = self.service().spreadsheets()  # pylint: disable=no-member
+        return self.execute(sheet.values().get(spreadsheetId=spreadsheet_id, range=range_name))
+
+    def batch_get_values(self, spreadsheet_id, range_names):
+        """Return the values of several ranges of one spreadsheet in a single request."""
+        sheet = self.service().spreadsheets()  # pylint: disable=no-member
+        response = self.execute(sheet.values().batchGet(spreadsheetId=spreadsheet_id, ranges=list(range_names)))
+        return [value_range.get("values", []) for value_range in response.get("valueRanges", [])]
+
+    def get_grid_properties(self, spreadsheet_id):
+        """Return {tab title: (row_count, column_count)} from the spreadsheet metadata."""
+        sheet = self.service().spreadsheets()  # pylint: disable=no-member
+        metadata = self.execute(
+            sheet.get(spreadsheetId=spreadsheet_id, fields="sheets.properties(title,gridProperties)")
+        )
+        grids = {}
+        for tab in metadata.get("sheets", []):
+            properties = tab.get("properties", {})
+            grid = properties.get("gridProperties", {})
+            grids[properties.get("title")] = (grid.get("rowCount", 0), grid.get("columnCount", 0))
+        return grids
+
+    def get_file_version(self, file_id):
+        """Return the Drive revision number of a file, which bumps on every edit."""
+        files = self.drive_service().files()  # pylint: disable=no-member
+        metadata = self.execute(files.get(fileId=file_id, fields="version,modifiedTime"))
+        return metadata.get("version")
+
+    def reset(self):
+        """Forget credentials, service and connections (e.g. after rotating keys)."""
+        with self._lock:
+            self._credentials = None
+            self._service = None
+            self._drive_service = None
+            self._local = threading.local()
+            self.timings = {}
+
+    def format_timings(self):
+        return ", ".join(f"{name}={ms:.1f}ms" for name, ms in self.timings.items())
+
+    def _authorized_http(self):
+        http = getattr(self._local, "http", None)
+        if http is None:
+            import google_auth_httplib2
+            import httplib2
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.credentials(), http=httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS)
+            )
+            self._local.http = http
+        return http
+
+    def _ensure_token(self, http):
+        credentials = self.credentials()
+        with self._lock:
+            if not credentials.valid:
+                import google_auth_httplib2
+                start = time.perf_counter()
+                credentials.refresh(google_auth_httplib2.Request(http.http))
+                self._record("token", start)
+
+    def _record(self, name, start):
+        self.timings[name] = (time.perf_counter() - start) * 1000
+
+
+sheets_client = SheetsClient()
+
+
+SheetSpec = namedtuple("SheetSpec", ["spreadsheet_id", "range_name"])
+SyncResult = namedtuple("SyncResult", ["data", "changed", "diff", "version"])
+SheetDiff = namedtuple("SheetDiff", ["added_rows", "removed_rows", "changed_cells", "changed_players"])
+
+
+def column_letter(index):
+    """Convert a 1-based column number to A1 letters (1 -> 'A', 28 -> 'AB')."""
+    letters = ""
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def column_number(letters):
+    """Convert A1 column letters to a 1-based column number ('AB' -> 28)."""
+    number = 0
+    for letter in letters.upper():
+        number = number * 26 + ord(letter) - 64
+    return number
+
+
+_CELL_PATTERN = re.compile(r"^([A-Za-z]+)(\d+)$")
+
+
+def split_range(range_name):
+    """Split an A1 range into its tab and start cell: 'Dash!B1:BQ22' -> ('Dash', 'B', 1)."""
+    tab, _, cells = range_name.rpartition("!")
+    match = _CELL_PATTERN.match(cells.split(":")[0])
+    if match is None:
+        raise ValueError(f"Cannot parse start cell of range {range_name!r}")
+    return tab, match.group(1).upper(), int(match.group(2))
+
+
+def grid_ranges(tab, start_column, start_row, row_count, column_count, chunk_rows=CHUNK_ROWS):
+    """A1 ranges from the start cell to the edge of the tab's grid, split into row chunks."""
+    if row_count < start_row or column_count < column_number(start_column):
+        return []
+    end_column = column_letter(column_count)
+    return [
+        f"{tab}!{start_column}{first}:{end_column}{min(first + chunk_rows - 1, row_count)}"
+        for first in range(start_row, row_count + 1, chunk_rows)
+    ]
+
+
+def find_player_name_column(data_frame):
+    """Return the first label column present in the frame, or None."""
+    for col in PLAYER_NAME_COLUMNS:
+        if col in data_frame.columns:
+            return col
+    return None
+
+
+def is_player_name(name):
+    """True for real player names, False for blanks and total rows like 'Staff Total:'."""
+    if name is None or (not isinstance(name, str) and pd.isna(name)):
+        return False
+    return str(name).strip().lower().replace(":", "") not in NON_PLAYER_NAMES
+
+
+def values_fingerprint(values):
+    """Return a content hash of the raw values returned by the Sheets API."""
+    payload = json.dumps(values, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def frame_fingerprint(data_frame):
+    """Return a content hash of a DataFrame, including its column names."""
+    digest = hashlib.sha1("\x1f".join(map(str, data_frame.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(data_frame, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+_frame_versions = {}
+
+
+def data_version(data_frame):
+    """Return the content hash of a loaded frame, memoized per frame object.
+
+    Loaded frames are shared across sessions and treated as immutable, so the
+    hash is computed once and reused as the key for derived caches.
+    """
+    key = id(data_frame)
+    version = _frame_versions.get(key)
+    if version is None:
+        version = frame_fingerprint(data_frame)
+        _frame_versions[key] = version
+        weakref.finalize(data_frame, _frame_versions.pop, key, None)
+    return version
+
+
+def normalize_headers(header_row, label_columns=8):
+    """Return unique column names for a sheet header row.
+
+    Blank headers among the first label_columns (B through I) become
+    'Column_B', 'Column_C', ...; repeated names get '_1', '_2', ... suffixes.
+    """
+    headers = pd.Series(list(header_row) + [''] * (label_columns - len(header_row)), dtype=object)
+    labels = pd.Series([f"Column_{chr(66 + i)}" for i in range(label_columns)], dtype=object)
+    blank = headers.head(label_columns).isin(['', None])
+    headers.iloc[:label_columns] = headers.head(label_columns).where(~blank, labels)
+    headers = headers.astype(str)
+    occurrence = headers.groupby(headers, sort=False).cumcount()
+    return headers.where(occurrence == 0, headers + "_" + occurrence.astype(str)).tolist()
+
+
+def values_to_grid(rows, width):
+    """Copy ragged value rows into a preallocated (len(rows), width) object array padded with ''."""
+    grid = np.full((len(rows), width), '', dtype=object)
+    for i, row in enumerate(rows):
+        length = min(len(row), width)
+        grid[i, :length] = row[:length] if length < len(row) else row
+    return grid
+
+
+def values_to_dataframe(values):
+    """Build a DataFrame from raw sheet values, fixing blank and duplicate headers."""
+    headers = normalize_headers(values[0])
+    data_frame = pd.DataFrame(values_to_grid(values[1:], len(headers)), columns=headers)
+    logging.info(f"DataFrame created with shape: {data_frame.shape}")
+    return data_frame
+
+
+def ingest_values(values):
+    """Turn the raw values of one range into a typed DataFrame, or None when empty."""
+    if not values:
+        return None
+    return parse_stat_columns(values_to_dataframe(values))
+
+
+def parse_stat_columns(data_frame, kinds=None, categorical=True):
+    """Convert raw string stat columns to typed columns in one vectorized pass.
+
+    Percent, ratio, innings and plain numeric cells are parsed together;
+    whole-number columns become Int32, other numeric columns float32 and the
+    remaining text columns categoricals (plain strings when categorical is
+    False). Which columns held percentages or innings, and how many decimal
+    places each numeric column was written with, is kept in data_frame.attrs
+    so they can be formatted back.
+
+    Passing kinds ({column: kind}, see column_kinds) skips inference and
+    forces each column's type, e.g. so every chunk of a large tab shares one
+    schema; cells that do not fit their kind become missing.
+    """
+    stat_cols = [col for col in data_frame.columns if col not in PLAYER_NAME_COLUMNS]
+    rows, width = len(data_frame), len(stat_cols)
+    cells = pd.Series(data_frame[stat_cols].to_numpy(dtype=object).ravel(), dtype=object)
+    cells = cells.fillna('').astype(str).str.strip()
+    empty = cells.isin(NULL_TOKENS)
+    is_pct = cells.str.endswith('%')
+    cleaned = cells.str.rstrip('%').str.replace(',', '', regex=False)
+    numbers = pd.to_numeric(cleaned.where(~empty), errors='coerce')
+    has_colon = cleaned.str.contains(':', regex=False) & ~empty
+    # Ratios with a zero denominator ('5:0') are missing values, not text
+    undefined = pd.Series(False, index=cells.index)
+    if has_colon.any():
+        parts = cleaned[has_colon].str.split(':', n=1, expand=True)
+        numerator, denominator = (pd.to_numeric(parts[i], errors='coerce') for i in (0, 1))
+        numbers[has_colon] = (numerator / denominator).replace([np.inf, -np.inf], np.nan)
+        undefined[has_colon] = numerator.notna() & (denominator == 0)
+    has_dot = cleaned.str.contains('.', regex=False)
+    # Decimal places as written, so values can be formatted back the way the sheet shows them
+    places = cleaned.str.partition('.')[2].str.len().where(~has_colon, RATIO_DECIMALS).where(~empty, 0)
+    # Thirds notation: a whole number, optionally followed by a single .0, .1 or .2
+    is_thirds = cleaned.str.fullmatch(r'-?\d*(?:\.[012])?') | empty
+
+    def grid(series):
+        return series.to_numpy().reshape(rows, width)
+
+    numbers_grid = grid(numbers).astype(float)
+    if kinds is None:
+        empty_grid = grid(empty)
+        parsed = ~np.isnan(numbers_grid) | empty_grid | grid(undefined)
+        is_numeric = parsed.all(axis=0) & ~empty_grid.all(axis=0)
+        is_percent = is_numeric & grid(is_pct).any(axis=0)
+        is_integer = is_numeric & ~is_percent & ~grid(has_dot | has_colon).any(axis=0)
+        kinds = {col: 'label' for col in data_frame.columns if col in PLAYER_NAME_COLUMNS}
+        for j, col in enumerate(stat_cols):
+            if not is_numeric[j]:
+                kinds[col] = 'text'
+            elif col in INNINGS_COLUMNS and grid(is_thirds)[:, j].all():
+                kinds[col] = 'innings'
+            elif is_integer[j]:
+                kinds[col] = 'integer'
+            else:
+                kinds[col] = 'percent' if is_percent[j] else 'float'
+
+    else:
+        kinds = dict(kinds)
+    positions = {col: j for j, col in enumerate(stat_cols)}
+    columns = {}
+    for col in data_frame.columns:
+        kind = kinds.get(col, 'label' if col in PLAYER_NAME_COLUMNS else 'text')
+        if kind == 'label':
+            labels = data_frame[col].fillna('').astype(str).str.strip()
+            columns[col] = labels.astype('category') if categorical else labels
+        elif kind == 'text':
+            columns[col] = data_frame[col].astype('category') if categorical else data_frame[col]
+        elif kind == 'innings' and grid(is_thirds)[:, positions[col]].all():
+            values = numbers_grid[:, positions[col]]
+            whole = np.trunc(values)
+            columns[col] = (whole + np.round((values - whole) * 10) / 3).astype(np.float32)
+        elif kind == 'integer':
+            values = numbers_grid[:, positions[col]]
+            fractional = ~np.isnan(values) & (values != np.trunc(values))
+            if fractional.any():
+                logging.warning(f"Dropping {fractional.sum()} non-integer values in integer column {col!r}")
+                values = np.where(fractional, np.nan, values)
+            columns[col] = pd.array(values, dtype='Int32')
+        else:
+            if kind == 'innings':
+                logging.warning(f"Column {col!r} is not in thirds notation; keeping it as decimal innings")
+                kinds[col] = 'float'
+            columns[col] = numbers_grid[:, positions[col]].astype(np.float32)
+    typed = pd.DataFrame(columns, index=data_frame.index)
+    places_grid = grid(places).astype(int)
+    typed.attrs = {
+        'percent_columns': [col for col in typed.columns if kinds.get(col) == 'percent'],
+        'innings_columns': [col for col in typed.columns if kinds.get(col) == 'innings'],
+        'decimals': {
+            col: int(places_grid[:, positions[col]].max(initial=0))
+            for col in typed.columns if kinds.get(col) in ('percent', 'float')
+        },
+    }
+    return typed
+
+
+def column_kinds(data_frame):
+    """Return {column: kind} for a frame built by parse_stat_columns.
+
+    Kinds are 'label', 'text', 'innings', 'integer', 'percent' and 'float'.
+    """
+    percent_columns = set(data_frame.attrs.get('percent_columns', []))
+    innings_columns = set(data_frame.attrs.get('innings_columns', []))
+    kinds = {}
+    for col in data_frame.columns:
+        series = data_frame[col]
+        if col in PLAYER_NAME_COLUMNS:
+            kinds[col] = 'label'
+        elif col in innings_columns:
+            kinds[col] = 'innings'
+        elif col in percent_columns:
+            kinds[col] = 'percent'
+        elif pd.api.types.is_integer_dtype(series):
+            kinds[col] = 'integer'
+        elif pd.api.types.is_float_dtype(series):
+            kinds[col] = 'float'
+        else:
+            kinds[col] = 'text'
+    return kinds
+
+
+def numeric_frame(data_frame):
+    """Return the stat columns as float64, parsing any raw strings ('32%' -> 32.0).
+
+    Label columns are left as NaN so the result keeps the frame's shape.
+    """
+    columns = {}
+    for col in data_frame.columns:
+        series = data_frame[col]
+        if col in PLAYER_NAME_COLUMNS:
+            columns[col] = np.full(len(series), np.nan)
+        elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            columns[col] = series.to_numpy(dtype=float, na_value=np.nan)
+        else:
+            text = series.astype(str).str.replace('%', '', regex=False)
+            columns[col] = pd.to_numeric(text, errors='coerce').to_numpy(dtype=float)
+    return pd.DataFrame(columns, index=data_frame.index)
+
+
+def _format_innings(value):
+    whole = int(np.floor(value + 1e-6))
+    return f"{whole}.{int(round((value - whole) * 3))}"
+
+
+def stat_formatters(data_frame):
+    """Return column -> formatter callables that render typed stats like the sheet does."""
+    percent_columns = set(data_frame.attrs.get('percent_columns', []))
+    innings_columns = set(data_frame.attrs.get('innings_columns', []))
+    decimals = data_frame.attrs.get('decimals', {})
+    formatters = {}
+    for col in data_frame.columns:
+        if col in percent_columns:
+            places = decimals.get(col, DEFAULT_PERCENT_DECIMALS)
+            formatters[col] = lambda value, places=places: f"{value:.{places}f}%"
+        elif col in innings_columns:
+            formatters[col] = _format_innings
+        elif pd.api.types.is_float_dtype(data_frame[col]):
+            places = decimals.get(col, DEFAULT_DECIMALS)
+            formatters[col] = lambda value, places=places: f"{value:.{places}f}"
+    return formatters
+
+
+def format_stats(stats, data_frame):
+    """Render a player's stats dict back to display strings using the frame's metadata."""
+    formatters = stat_formatters(data_frame)
+    formatted = {}
+    for key, value in stats.items():
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            formatted[key] = ''
+        elif key in formatters:
+            formatted[key] = formatters[key](value)
+        else:
+            formatted[key] = str(value)
+    return formatted
+
+
+def _row_keys(data_frame):
+    """Stable per-row keys: the player name, suffixed when a name repeats."""
+    name_col = find_player_name_column(data_frame)
+    if name_col is None:
+        return pd.Index(range(len(data_frame)))
+    names = data_frame[name_col].astype(str).str.strip()
+    occurrence = names.groupby(names).cumcount()
+    return pd.Index(names.where(occurrence == 0, names + "#" + occurrence.astype(str)))
+
+
+def diff_frames(old, new):
+    """Diff two sheet frames at row and cell level, keyed by player name."""
+    old = old.set_axis(_row_keys(old), axis=0)
+    new = new.set_axis(_row_keys(new), axis=0)
+    added_rows = list(new.index.difference(old.index, sort=False))
+    removed_rows = list(old.index.difference(new.index, sort=False))
+    rows = new.index.intersection(old.index, sort=False)
+    columns = new.columns.intersection(old.columns, sort=False)
+    before = old.loc[rows, columns].astype(object)
+    after = new.loc[rows, columns].astype(object)
+    mask = before.ne(after) & ~(before.isna() & after.isna())
+    changed_cells = {}
+    stacked = mask.stack()
+    for row, col in stacked[stacked].index:
+        changed_cells.setdefault(row, {})[col] = (before.at[row, col], after.at[row, col])
+    # New or dropped columns touch every row
+    if len(columns) != len(new.columns) or len(columns) != len(old.columns):
+        changed_players = list(new.index)
+    else:
+        changed_players = added_rows + list(changed_cells)
+    return SheetDiff(added_rows, removed_rows, changed_cells, changed_players)
+
+
+class SheetSync:
+    """Change-detecting sync of one sheet range.
+
+    Each sync first checks a cheap change signal: the Drive file version, or
+    failing that a hash of the returned values. The DataFrame is only rebuilt
+    (and diffed against the previous copy) when the data actually changed.
+
+    With discover_range, range_name only anchors the tab and start cell; the
+    end of the range comes from the tab's gridProperties, so added rows and
+    columns are picked up without code changes. The discovered ranges are
+    cached until the file version changes (or GRID_TTL_SECONDS passes).
+    """
+
+    def __init__(self, spreadsheet_id=SHEET_ID, range_name=RANGE_NAME, client=None,
+                 discover_range=True, clock=time.monotonic):
+        self.spreadsheet_id = spreadsheet_id
+        self.range_name = range_name
+        self.client = client or sheets_client
+        self.discover_range = discover_range
+        self.use_drive_version = True
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget the synced copy so the next sync does a full rebuild."""
+        self.version = None
+        self.fingerprint = None
+        self.data = None
+        self.last_result = None
+        self.ranges = None
+        self.ranges_version = None
+        self.ranges_resolved_at = None
+
+    def sync(self):
+        """Return a SyncResult for the range, rebuilding only on change."""
+        with self._lock:
+            version = self._drive_version()
+            if self.data is not None and version is not None and version == self.version:
+                logging.info(f"Sheet unchanged (version {version}); skipping download.")
+                return self._unchanged(version)
+            values = self._fetch_values(self._resolve_ranges(version))
+            logging.info(f"Sheets timings: {self.client.format_timings()}")
+            if not values:
+                logging.warning("No values returned from Google Sheets.")
+                return SyncResult(None, False, None, version)
+            fingerprint = values_fingerprint(values)
+            if self.data is not None and fingerprint == self.fingerprint:
+                logging.info("Sheet values unchanged; reusing existing DataFrame.")
+                self.version = version
+                return self._unchanged(version)
+            data = ingest_values(values)
+            diff = diff_frames(self.data, data) if self.data is not None else None
+            if diff is not None:
+                logging.info(f"Sheet changed for players: {diff.changed_players}")
+            self.version, self.fingerprint, self.data = version, fingerprint, data
+            self.last_result = SyncResult(data, True, diff, version)
+            return self.last_result
+
+    def _resolve_ranges(self, version):
+        """Return the ranges covering the tab, re-reading its size only when stale."""
+        if self.ranges is not None:
+            if version is not None and version == self.ranges_version:
+                return self.ranges
+            if version is None and self._clock() - self.ranges_resolved_at < GRID_TTL_SECONDS:
+                return self.ranges
+        ranges = [self.range_name]
+        if self.discover_range:
+            try:
+                tab, start_column, start_row = split_range(self.range_name)
+                grid = self.client.get_grid_properties(self.spreadsheet_id).get(tab.strip("'"))
+                discovered = grid_ranges(tab, start_column, start_row, *grid) if grid else []
+                if discovered:
+                    ranges = discovered
+                    logging.info(f"Discovered {tab} grid of {grid[0]}x{grid[1]}; fetching {ranges}")
+                else:
+                    logging.warning(f"No grid found for tab {tab!r}; using {self.range_name}")
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logging.warning(f"Range discovery failed, using {self.range_name}: {e}")
+        self.ranges, self.ranges_version, self.ranges_resolved_at = ranges, version, self._clock()
+        return ranges
+
+    def _fetch_values(self, ranges):
+        values = []
+        for range_name in ranges:
+            values.extend(self.client.get_values(self.spreadsheet_id, range_name).get("values", []))
+        return values
+
+    def _unchanged(self, version):
+        self.last_result = SyncResult(self.data, False, SheetDiff([], [], {}, []), version)
+        return self.last_result
+
+    def _drive_version(self):
+        if not self.use_drive_version:
+            return None
+        from googleapiclient.errors import HttpError
+        try:
+            return self.client.get_file_version(self.spreadsheet_id)
+        except HttpError as e:
+            logging.warning(f"Drive version check unavailable, falling back to content hash: {e}")
+            self.use_drive_version = False
+            return None
+
+
+sheet_sync = SheetSync()
+
+
+def _fetch_spreadsheet(client, spreadsheet_id, specs):
+    try:
+        all_values = client.batch_get_values(spreadsheet_id, [spec.range_name for spec in specs])
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logging.error(f"Error fetching {spreadsheet_id}: {e}")
+        return {spec: None for spec in specs}
+    return {spec: ingest_values(values) for spec, values in zip(specs, all_values)}
+
+
+def fetch_ranges(specs, client=None, max_workers=FETCH_WORKERS):
+    """Fetch many (spreadsheet_id, range_name) specs and return {SheetSpec: DataFrame}.
+
+    Ranges of the same spreadsheet share one values().batchGet request and
+    different spreadsheets are fetched concurrently. Ranges that are empty or
+    could not be fetched map to None.
+    """
+    client = client or sheets_client
+    by_spreadsheet = {}
+    for spec in map(SheetSpec._make, specs):
+        by_spreadsheet.setdefault(spec.spreadsheet_id, []).append(spec)
+    if not by_spreadsheet:
+        return {}
+    start = time.perf_counter()
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(by_spreadsheet))) as pool:
+        for frames in pool.map(lambda item: _fetch_spreadsheet(client, *item), by_spreadsheet.items()):
+            results.update(frames)
+    logging.info(
+        f"Fetched {len(results)} ranges from {len(by_spreadsheet)} spreadsheets "
+        f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+    )
+    return results
+
+
+def iter_value_chunks(spreadsheet_id, range_name, client=None, chunk_rows=CHUNK_ROWS):
+    """Yield a range's raw values one block of at most chunk_rows rows at a time.
+
+    The range is extended to the tab's grid size like SheetSync does, and each
+    block is requested separately, so only one block is held in memory.
+    """
+    client = client or sheets_client
+    tab, start_column, start_row = split_range(range_name)
+    grid = client.get_grid_properties(spreadsheet_id).get(tab.strip("'"))
+    ranges = grid_ranges(tab, start_column, start_row, *grid, chunk_rows=chunk_rows) if grid else [range_name]
+    for chunk_range in ranges:
+        values = client.get_values(spreadsheet_id, chunk_range).get("values", [])
+        if values:
+            yield values
+
+
+def iter_typed_chunks(value_chunks, kinds=None):
+    """Convert blocks of raw rows (header row first) to typed DataFrames.
+
+    Every chunk gets the same column kinds, so all chunks share one schema
+    and can be appended to one dataset. Pass kinds to fix that schema up
+    front; otherwise it is inferred from the rows read so far. Whole-number
+    columns are stored as float there, since a later block may hold decimals,
+    and blocks are held back (at most SCHEMA_CHUNKS) while a column is still
+    blank, so a column empty at the top of the tab keeps its numeric type.
+    Text columns stay plain strings rather than per-chunk categoricals.
+    """
+    headers, offset, pending = None, 0, []
+    for values in value_chunks:
+        if headers is None:
+            headers, values = normalize_headers(values[0]), values[1:]
+        if not values:
+            continue
+        frame = pd.DataFrame(
+            values_to_grid(values, len(headers)),
+            columns=headers,
+            index=pd.RangeIndex(offset, offset + len(values)),
+        )
+        offset += len(values)
+        if kinds is not None:
+            yield parse_stat_columns(frame, kinds, categorical=False)
+            continue
+        pending.append(frame)
+        if len(pending) < SCHEMA_CHUNKS and _blank_columns(pd.concat(pending)):
+            continue
+        kinds = _chunk_kinds(pd.concat(pending))
+        for frame in pending:
+            yield parse_stat_columns(frame, kinds, categorical=False)
+        pending = []
+    if pending:
+        kinds = _chunk_kinds(pd.concat(pending))
+        for frame in pending:
+            yield parse_stat_columns(frame, kinds, categorical=False)
+
+
+def _blank_columns(data_frame):
+    """Headed stat columns with no value in any row of a raw frame.
+
+    Columns without a header in the sheet (spacers and the padding added by
+    normalize_headers) are left out.
+    """
+    stat_cols = [col for col in data_frame.columns if col and not col.startswith(('Column_', '_'))]
+    cells = data_frame[stat_cols].fillna('').astype(str).apply(lambda col: col.str.strip())
+    return [col for col in stat_cols if cells[col].isin(NULL_TOKENS).all()]
+
+
+def _chunk_kinds(data_frame):
+    """Column kinds for chunked ingest, with integer columns widened to float."""
+    kinds = column_kinds(parse_stat_columns(data_frame, categorical=False))
+    return {col: 'float' if kind == 'integer' else kind for col, kind in kinds.items()}
+
+
+def last_sheet_diff(data_frame):
+    """The SheetDiff from the sync that produced this frame, or None when unknown.
+
+    Lets consumers update only the affected players. None (first load,
+    snapshot or offline data) means every player should be treated as changed.
+    """
+    result = sheet_sync.last_result
+    if result is None or result.data is not data_frame:
+        return None
+    return result.diff
+
+
 def fetch_sheet_data():
-    """Fetch data from Google Sheets and return as DataFrame."""
+    """Fetch data from Google Sheets and return as DataFrame.
+
+    Unchanged sheets reuse the previously built DataFrame; see SheetSync.
+    """
     try:
         logging.info("Fetching data from Google Sheets...")
-        creds = service_account.Credentials.from_service_account_file(
-            CREDENTIALS_FILE,
-            scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-        )
-        service = build("sheets", "v4", credentials=creds)
-        sheet = service.spreadsheets()  # pylint: disable=no-member
-        result = sheet.values().get(spreadsheetId=SHEET_ID, range=RANGE_NAME).execute()
-        values = result.get("values", [])
-        if not values:
-            logging.warning("No values returned from Google Sheets.")
-            return None
-        # Handle mixed header structure
-        headers = values[0]  # First row
-        # Create generic headers for columns B-I (columns 0-7 in the data)
-        for i in range(8):  # B through I (8 columns)
-            if i >= len(headers) or not headers[i]:
-                if i < len(headers):
-                    headers[i] = f"Column_{chr(66+i)}"  # B, C, D, etc.
-                else:
-                    headers.append(f"Column_{chr(66+i)}")
-        # Handle duplicate column names by adding suffixes
-        seen_names = {}
-        unique_headers = []
-        for header in headers:
-            if header in seen_names:
-                seen_names[header] += 1
-                unique_headers.append(f"{header}_{seen_names[header]}")
-            else:
-                seen_names[header] = 0
-                unique_headers.append(header)
-        # Ensure all data rows have the same number of columns as headers
-        data_rows = []
-        for row in values[1:]:
-            # Pad row to match header length
-            padded_row = row + [''] * (len(unique_headers) - len(row))
-            data_rows.append(padded_row)
-        data_frame = pd.DataFrame(data_rows, columns=unique_headers)
-        logging.info(f"DataFrame created with shape: {data_frame.shape}")
-        return data_frame
+        return sheet_sync.sync().data
     except FileNotFoundError as e:
         logging.error(f"Error fetching data: {e}")
         return None
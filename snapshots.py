@@ -0,0 +1,156 @@
+# Local Arrow snapshots of sheet data for fast and offline startup
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from sheets import CHUNK_ROWS, frame_fingerprint, iter_typed_chunks, iter_value_chunks
+
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_PREFIX = "sheet-"
+SNAPSHOT_SUFFIX = ".arrow"
+TIMESTAMP_FORMAT = "%Y%m%dT%H%M%S%fZ"
+
+
+class SnapshotStore:
+    """Directory of Arrow IPC snapshots, one file per successful fetch.
+
+    Files are named by fetch time (UTC) and are memory-mapped when read, so
+    loading the latest snapshot at startup takes milliseconds.
+    """
+
+    def __init__(self, directory=SNAPSHOT_DIR):
+        self.directory = str(directory)
+        self._lock = threading.Lock()
+        self._last_fingerprint = None
+
+    def save(self, data_frame, fetched_at=None):
+        """Write a snapshot unless it matches the latest one; return its path."""
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+        fingerprint = frame_fingerprint(data_frame)
+        with self._lock:
+            if fingerprint == self._latest_fingerprint():
+                return None
+            os.makedirs(self.directory, exist_ok=True)
+            table = pa.Table.from_pandas(data_frame, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[b"fingerprint"] = fingerprint.encode("ascii")
+            metadata[b"fetched_at"] = fetched_at.isoformat().encode("ascii")
+            table = table.replace_schema_metadata(metadata)
+            path = os.path.join(self.directory, self._file_name(fetched_at))
+            tmp_path = path + ".tmp"
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+            self._last_fingerprint = fingerprint
+        logging.info(f"Saved sheet snapshot {path}")
+        return path
+
+    def list_snapshots(self):
+        """Return (fetched_at, path) pairs for every snapshot, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        snapshots = []
+        for name in os.listdir(self.directory):
+            if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX):
+                stamp = name[len(SNAPSHOT_PREFIX):-len(SNAPSHOT_SUFFIX)]
+                try:
+                    fetched_at = datetime.strptime(stamp, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+                except ValueError:
+                    continue
+                snapshots.append((fetched_at, os.path.join(self.directory, name)))
+        return sorted(snapshots)
+
+    def load(self, path):
+        """Read one snapshot into a DataFrame through a memory map."""
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas()
+
+    def load_latest(self):
+        """Return (data, fetched_at) for the newest snapshot, or (None, None)."""
+        snapshots = self.list_snapshots()
+        if not snapshots:
+            return None, None
+        fetched_at, path = snapshots[-1]
+        try:
+            data = self.load(path)
+        except (OSError, pa.ArrowInvalid) as e:
+            logging.error(f"Could not read snapshot {path}: {e}")
+            return None, None
+        logging.info(f"Loaded sheet snapshot {path} with shape {data.shape}")
+        return data, fetched_at
+
+    def _latest_fingerprint(self):
+        if self._last_fingerprint is None:
+            snapshots = self.list_snapshots()
+            if snapshots:
+                try:
+                    with pa.memory_map(snapshots[-1][1], "r") as source:
+                        metadata = pa.ipc.open_file(source).schema.metadata or {}
+                    self._last_fingerprint = metadata.get(b"fingerprint", b"").decode("ascii")
+                except (OSError, pa.ArrowInvalid):
+                    self._last_fingerprint = None
+        return self._last_fingerprint
+
+    @staticmethod
+    def _file_name(fetched_at):
+        stamp = fetched_at.astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT)
+        return f"{SNAPSHOT_PREFIX}{stamp}{SNAPSHOT_SUFFIX}"
+
+
+def write_dataset(frames, path):
+    """Append typed DataFrame chunks to one Parquet file, one row group per chunk.
+
+    Chunks are written as they arrive, so memory stays bounded by the chunk
+    size. The file is replaced atomically once complete; returns the row count
+    (None when there were no chunks).
+    """
+    writer, rows = None, 0
+    tmp_path = f"{path}.tmp"
+    try:
+        for frame in frames:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                metadata = dict(table.schema.metadata or {})
+                metadata[b"sheet_attrs"] = json.dumps(frame.attrs).encode("utf-8")
+                schema = table.schema.with_metadata(metadata)
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                writer = pq.ParquetWriter(tmp_path, schema)
+            writer.write_table(table.cast(writer.schema))
+            rows += len(frame)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            os.remove(tmp_path)
+        raise
+    if writer is None:
+        return None
+    writer.close()
+    os.replace(tmp_path, path)
+    logging.info(f"Wrote {rows} rows to {path}")
+    return rows
+
+
+def read_dataset(path, columns=None):
+    """Read a dataset written by write_dataset, restoring the percent/innings attrs."""
+    table = pq.read_table(path, columns=columns)
+    data_frame = table.to_pandas()
+    attrs = (table.schema.metadata or {}).get(b"sheet_attrs")
+    if attrs:
+        data_frame.attrs = json.loads(attrs)
+    return data_frame
+
+
+def ingest_range_to_dataset(spreadsheet_id, range_name, path, client=None, chunk_rows=CHUNK_ROWS, kinds=None):
+    """Stream a (possibly very large) sheet range into a Parquet file in row chunks.
+
+    kinds ({column: kind}) fixes the column types instead of inferring them.
+    """
+    chunks = iter_value_chunks(spreadsheet_id, range_name, client=client, chunk_rows=chunk_rows)
+    return write_dataset(iter_typed_chunks(chunks, kinds), path)
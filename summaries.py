@@ -0,0 +1,243 @@
+# AI player summaries and their persistent cache
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from functools import lru_cache
+
+from openai_client import openai_manager
+from sheets import PLAYER_NAME_COLUMNS
+
+# Bump whenever the prompt below changes so cached summaries are regenerated
+PROMPT_VERSION = 2
+SUMMARY_CACHE_PATH = "summary_cache.sqlite3"
+SUMMARY_TTL_SECONDS = 7 * 24 * 3600  # Sheet data is updated weekly
+SUMMARY_MAX_ENTRIES = 500
+
+
+DEFAULT_MODEL = "gpt-4"
+SYSTEM_PROMPT = "You are a helpful baseball analytics assistant."
+PROMPT_INSTRUCTIONS = (
+    "You are a baseball analytics expert. Given the following player's stats, "
+    "write a short summary of how they are playing, what they are doing well, and what needs improvement. "
+    "Be specific and use the stats provided."
+)
+PERCENTILE_NOTE = "pNN after a value is its percentile among the team's players (p100 = highest value)."
+
+
+def _is_duplicate_column(stat, player_stats):
+    base, sep, suffix = stat.rpartition('_')
+    return bool(sep) and suffix.isdigit() and base in player_stats
+
+
+def prompt_stats(player_stats):
+    """Return the (stat, value) pairs worth sending, in sheet order.
+
+    Empty cells, pitch-type label columns and duplicated '_N' suffix columns
+    are dropped.
+    """
+    pairs = []
+    for stat, value in player_stats.items():
+        text = "" if value is None else str(value).strip()
+        if not text or text.lower() == "nan" or stat in PLAYER_NAME_COLUMNS:
+            continue
+        if _is_duplicate_column(stat, player_stats):
+            continue
+        pairs.append((stat, text))
+    return pairs
+
+
+def build_prompt(player_stats, percentiles=None):
+    """Return a compact, deterministic prompt: one 'stat: value' line per relevant stat."""
+    lines = []
+    for stat, value in prompt_stats(player_stats):
+        percentile = percentiles.get(stat) if percentiles else None
+        lines.append(f"{stat}: {value}" if percentile is None else f"{stat}: {value} p{percentile:.0f}")
+    name = player_stats.get(PLAYER_NAME_COLUMNS[0])
+    header = PROMPT_INSTRUCTIONS + "\n\n"
+    if name:
+        header += f"Player: {str(name).strip()}\n"
+    if percentiles:
+        header += PERCENTILE_NOTE + "\n"
+    return header + "Stats:\n" + "\n".join(lines)
+
+
+@lru_cache(maxsize=8)
+def _token_encoding(model_name):
+    import tiktoken  # Optional: only used to report exact token counts
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text, model_name=DEFAULT_MODEL):
+    """Token count via tiktoken when installed, else a ~4 characters per token estimate."""
+    try:
+        return len(_token_encoding(model_name).encode(text))
+    except ImportError:
+        return max(1, len(text) // 4)
+
+
+def build_messages(player_stats, percentiles=None, model_name=DEFAULT_MODEL):
+    """Return the chat messages asking for a summary of these stats."""
+    prompt = build_prompt(player_stats, percentiles)
+    logging.info(f"Summary prompt: {count_tokens(SYSTEM_PROMPT + prompt, model_name)} tokens")
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def request_player_summary(client, player_stats, model_name, percentiles=None):
+    """Call the chat completions API and return the summary text; API errors propagate."""
+    messages = build_messages(player_stats, percentiles, model_name)
+    response = client.chat.completions.create(model=model_name, messages=messages)
+    return response.choices[0].message.content
+
+
+# OpenAI summary function
+def generate_player_summary(player_stats, api_key, model_name, percentiles=None):
+    """Send player stats to OpenAI and get a summary."""
+    logging.info(f"Calling OpenAI model {model_name} for player summary. Stats: {player_stats}")
+    try:
+        # Reuse the pooled client for this key (timeouts, retries and circuit breaker)
+        summary = openai_manager.call(
+            api_key, lambda client: request_player_summary(client, player_stats, model_name, percentiles)
+        )
+        logging.info(f"AI summary generated: {summary}")
+        return summary
+    except Exception as e:
+        logging.error(f"OpenAI API error: {e}")
+        return f"Error generating summary: {e}"
+
+
+def stream_player_summary(player_stats, api_key, model_name, percentiles=None):
+    """Yield summary text as it streams from OpenAI; API errors propagate.
+
+    The complete text is logged once the stream finishes.
+    """
+    logging.info(f"Streaming OpenAI model {model_name} for player summary. Stats: {player_stats}")
+    messages = build_messages(player_stats, percentiles, model_name)
+    stream = openai_manager.call(
+        api_key,
+        lambda client: client.chat.completions.create(model=model_name, messages=messages, stream=True),
+    )
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            yield delta
+    logging.info(f"AI summary generated: {''.join(parts)}")
+
+
+def is_error_summary(summary):
+    return not summary or summary.startswith("Error generating summary")
+
+
+def summary_key(player_stats, model_name, percentiles=None, prompt_version=PROMPT_VERSION):
+    """Hash of (model, prompt version, prompt text) identifying one summary.
+
+    The prompt is built from the stats and staff percentiles exactly as it is
+    sent, so a teammate's change that moves this player's percentiles also
+    changes the key.
+    """
+    payload = json.dumps(
+        {
+            "model": model_name, "prompt_version": prompt_version,
+            "system": SYSTEM_PROMPT, "prompt": build_prompt(player_stats, percentiles),
+        },
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """SQLite-backed cache of generated summaries shared by all sessions.
+
+    Entries are keyed on the prompt built from the player's stats and staff
+    percentiles, so a sheet update that changes either misses the cache; storing the new summary drops that
+    player's older entries. Entries also expire after ttl_seconds, and the
+    least recently used ones are evicted beyond max_entries.
+    """
+
+    def __init__(self, path=SUMMARY_CACHE_PATH, ttl_seconds=SUMMARY_TTL_SECONDS,
+                 max_entries=SUMMARY_MAX_ENTRIES, clock=time.time):
+        self.path = str(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def get(self, player_name, player_stats, model_name, percentiles=None):
+        """Return the cached summary for these stats and percentiles, or None."""
+        key = summary_key(player_stats, model_name, percentiles)
+        now = self._clock()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT summary, created_at FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE summaries SET last_used = ? WHERE key = ?", (now, key))
+        logging.info(f"Using cached AI summary for {player_name}.")
+        return row[0]
+
+    def put(self, player_name, player_stats, model_name, summary, percentiles=None):
+        """Store a summary, replacing older ones for the same player and model."""
+        key = summary_key(player_stats, model_name, percentiles)
+        now = self._clock()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM summaries WHERE player = ? AND model = ? AND key != ?",
+                (player_name, model_name, key),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, player, model, summary, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, player_name, model_name, summary, now, now),
+            )
+            conn.execute("DELETE FROM summaries WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM summaries WHERE key IN (SELECT key FROM summaries"
+                " ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def invalidate_player(self, player_name):
+        """Drop every cached summary for a player."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM summaries WHERE player = ?", (player_name,))
+
+    def clear(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM summaries")
+
+    def __len__(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        with self._init_lock:
+            if not self._initialized:
+                with conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS summaries (key TEXT PRIMARY KEY, player TEXT,"
+                        " model TEXT, summary TEXT, created_at REAL, last_used REAL)"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS summaries_player ON summaries (player, model)")
+                self._initialized = True
+        return conn
+
+
+summary_cache = SummaryCache(os.getenv("SUMMARY_CACHE_PATH", SUMMARY_CACHE_PATH))
@@ -0,0 +1,162 @@
+# Batch pre-generation of AI player summaries after each data refresh
+import argparse
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import openai
+
+from analytics import player_percentiles
+from openai_client import openai_manager
+from sheets import data_version, find_player_name_column, format_stats, is_player_name, last_sheet_diff
+from summaries import DEFAULT_MODEL, request_player_summary, summary_cache
+
+DEFAULT_WORKERS = 4
+
+
+def player_stats_rows(data):
+    """Return (player name, display stats) for every real player row."""
+    name_col = find_player_name_column(data)
+    if name_col is None:
+        return []
+    rows = []
+    for stats in data.to_dict("records"):
+        if is_player_name(stats[name_col]):
+            rows.append((str(stats[name_col]).strip(), format_stats(stats, data)))
+    return rows
+
+
+class RateLimitGate:
+    """Shared pause so one 429 backs off every worker, not just the one that hit it."""
+
+    def __init__(self, sleep=time.sleep, clock=time.monotonic):
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def wait(self):
+        with self._lock:
+            delay = self._resume_at - self._clock()
+        if delay > 0:
+            self._sleep(delay)
+
+    def pause(self, seconds):
+        with self._lock:
+            self._resume_at = max(self._resume_at, self._clock() + seconds)
+
+
+def generate_with_retries(api_key, player_stats, model_name, gate, base_url=None, percentiles=None):
+    """Request one summary through the shared client's retries and circuit breaker.
+
+    A 429 pauses the gate, so every worker backs off instead of just this one.
+    """
+    def request(client):
+        gate.wait()
+        return request_player_summary(client, player_stats, model_name, percentiles)
+
+    def on_retry(error, delay):
+        if isinstance(error, openai.RateLimitError):
+            gate.pause(delay)  # The next attempt waits at the gate
+            return True
+        return False
+
+    return openai_manager.call(api_key, request, base_url=base_url, on_retry=on_retry)
+
+
+def pregenerate_summaries(data, api_key, model_name=DEFAULT_MODEL, max_workers=DEFAULT_WORKERS,
+                          base_url=None, cache=None):
+    """Generate and store summaries for every player not already cached.
+
+    Returns a Counter of outcomes: 'cached', 'generated' and 'failed'.
+    """
+    cache = summary_cache if cache is None else cache
+    gate = RateLimitGate()
+    outcomes = Counter()
+    diff = last_sheet_diff(data)
+    if diff is not None:
+        # Players dropped from the sheet no longer need their summaries
+        for name in diff.removed_rows:
+            cache.invalidate_player(name)
+    pending = []
+    for name, stats in player_stats_rows(data):
+        percentiles = player_percentiles(data, name)
+        if cache.get(name, stats, model_name, percentiles) is None:
+            pending.append((name, stats, percentiles))
+        else:
+            outcomes["cached"] += 1
+    if diff is not None:
+        # Players whose stats just changed are the ones most likely to be viewed next
+        changed = set(diff.changed_players)
+        pending.sort(key=lambda item: item[0] not in changed)
+
+    def generate(item):
+        name, stats, percentiles = item
+        try:
+            summary = generate_with_retries(
+                api_key, stats, model_name, gate, base_url=base_url, percentiles=percentiles
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.error(f"Could not pre-generate summary for {name}: {e}")
+            return "failed"
+        cache.put(name, stats, model_name, summary, percentiles)
+        return "generated"
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        outcomes.update(pool.map(generate, pending))
+    logging.info(f"Summary pre-generation finished: {dict(outcomes)}")
+    return outcomes
+
+
+_started_versions = set()
+_started_lock = threading.Lock()
+
+
+def start_background_pregeneration(data, api_key, model_name=DEFAULT_MODEL, **kwargs):
+    """Start pre-generation in a daemon thread, once per data version and model.
+
+    Returns True when a new job was started.
+    """
+    key = (data_version(data), model_name)
+    with _started_lock:
+        if key in _started_versions:
+            return False
+        _started_versions.add(key)
+    logging.info("Starting background pre-generation of player summaries.")
+    threading.Thread(
+        target=pregenerate_summaries, args=(data, api_key, model_name), kwargs=kwargs, daemon=True
+    ).start()
+    return True
+
+
+def main(argv=None):
+    """CLI: fetch the sheet and pre-generate every player's summary."""
+    from dotenv import load_dotenv
+
+    from data_cache import get_sheet_data
+
+    parser = argparse.ArgumentParser(description="Pre-generate AI summaries for every player.")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--base-url", default=None, help="OpenAI-compatible endpoint (e.g. a local fake)")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        logging.error("OPENAI_API_KEY is not set.")
+        return 1
+    data = get_sheet_data()
+    if data is None:
+        logging.error("Failed to load data from Google Sheets.")
+        return 1
+    outcomes = pregenerate_summaries(data, api_key, args.model, args.workers, base_url=args.base_url)
+    print(f"cached={outcomes['cached']} generated={outcomes['generated']} failed={outcomes['failed']}")
+    return 1 if outcomes["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,53 @@
+import pytest
+
+import analytics
+import charts
+import data_cache
+import formatting
+import history
+import players
+import refresh_daemon
+import sheets
+import summaries
+from snapshots import SnapshotStore
+
+
+class FakeClock:
+    """A clock for code that takes one (time.monotonic style), advanced by setting .now."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_state(tmp_path, monkeypatch):
+    """Clear process-wide caches so each test starts from a cold start."""
+    monkeypatch.setattr(data_cache, 'snapshot_store', SnapshotStore(tmp_path / 'snapshots'))
+    monkeypatch.setattr(data_cache, '_seeded', False)
+    # Importing app installs the refresh pipeline as the loader; tests start from the plain one
+    monkeypatch.setattr(data_cache.sheet_cache, 'loader', data_cache._load_sheet)
+    monkeypatch.setattr(data_cache.sheet_loader, 'schedule', None)
+    monkeypatch.delenv('OFFLINE_MODE', raising=False)
+    monkeypatch.delenv('REFRESH_ALLOW_SHRINK', raising=False)
+    monkeypatch.setattr(refresh_daemon, '_last_accepted', None)
+    monkeypatch.setattr(refresh_daemon, '_rejected_shrink', (None, 0.0))
+    monkeypatch.setattr(summaries.summary_cache, 'path', str(tmp_path / 'summaries.sqlite3'))
+    monkeypatch.setattr(summaries.summary_cache, '_initialized', False)
+    monkeypatch.setattr(history, 'history_store', history.HistoryStore(tmp_path / 'history.sqlite3'))
+    data_cache.invalidate_sheet_data()
+    sheets.sheets_client.reset()
+    sheets.sheet_sync.reset()
+    formatting.overview_cache.clear()
+    charts.chart_data_cache.clear()
+    charts.figure_cache.clear()
+    charts.trend_cache.clear()
+    analytics.analytics_cache.clear()
+    players.registry_cache.clear()
+    yield
+    data_cache.sheet_loader.stop()
+    data_cache.invalidate_sheet_data()
+    sheets.sheets_client.reset()
+    sheets.sheet_sync.reset()
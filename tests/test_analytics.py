@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import get_analytics, player_percentiles, stat_direction
+from sheets import parse_stat_columns
+
+
+def staff():
+    return parse_stat_columns(pd.DataFrame({
+        'Column_B': ['John Doe', 'Jane Roe', 'Sam Lee', 'Team Total'],
+        'ERA': ['2.00', '4.00', '6.00', '4.00'],
+        'K%': ['30%', '20%', '25%', '25%'],
+        'Velo': ['90', '90', '90', '90'],
+    }))
+
+
+class TestStaffAnalytics:
+    """Test cases for staff-relative percentiles, z-scores and ranks."""
+
+    def test_matrices_cover_players_only(self):
+        analytics = get_analytics(staff())
+        assert list(analytics.percentiles.index) == [0, 1, 2]
+        assert list(analytics.percentiles.columns) == ['ERA', 'K%', 'Velo']
+
+    def test_percentiles_and_ranks_follow_stat_direction(self):
+        analytics = get_analytics(staff())
+        assert list(analytics.percentiles['ERA']) == pytest.approx([100 / 3, 200 / 3, 100])
+        # Lower ERA is better: best performance and rank 1 for the 2.00 ERA
+        assert list(analytics.performance['ERA']) == pytest.approx([100, 200 / 3, 100 / 3])
+        assert list(analytics.ranks['ERA']) == [1, 2, 3]
+        assert list(analytics.ranks['K%']) == [1, 3, 2]
+        assert analytics.highest['ERA'] == 2 and analytics.lowest['ERA'] == 0
+
+    def test_zscores(self):
+        analytics = get_analytics(staff())
+        era = analytics.zscores['ERA']
+        assert era.mean() == pytest.approx(0)
+        assert list(era) == pytest.approx([-np.sqrt(1.5), 0, np.sqrt(1.5)])
+        assert analytics.zscores['Velo'].isna().all()  # No spread, no z-score
+
+    def test_computed_once_per_data_version(self):
+        data = staff()
+        assert get_analytics(data) is get_analytics(data.copy())
+
+
+def test_player_percentiles():
+    data = staff()
+    assert player_percentiles(data, 'sam lee ')['ERA'] == 100.0
+    assert player_percentiles(data, 'John Doe')['K%'] == 100.0
+    assert player_percentiles(data, 'Team Total') is None
+    assert player_percentiles(data, 'Nobody') is None
+
+
+def test_stat_direction():
+    assert stat_direction('k/9') == 1
+    assert stat_direction('WHIP') == -1
+    assert stat_direction('Velo') == 0
@@ -0,0 +1,92 @@
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+import history
+from charts import (
+    NJIT_TEMPLATE, build_chart_data, build_figure, get_chart_data, get_figure_json, get_trend_cube,
+    get_trend_figure_json, plot_frame, trend_changes,
+)
+
+
+def sample_frame():
+    return pd.DataFrame({
+        'Column_B': ['John Doe', 'Jane Smith', 'Sam Lee'],
+        'Column_C': ['FB', 'SL', 'CH'],
+        'K%': ['32%', '28%', ''],
+        'ERA': np.array([2.5, np.nan, 4.1], dtype=np.float32),
+        'Notes': ['', '', ''],
+    })
+
+
+class TestChartData:
+    """Test cases for the shared chart data cache."""
+
+    def test_only_numeric_columns_are_plottable(self):
+        chart_data = build_chart_data(sample_frame())
+        assert chart_data.plottable == ['K%', 'ERA']
+        assert chart_data.numeric['K%'].tolist()[:2] == [32.0, 28.0]
+
+    def test_plot_frame_drops_rows_missing_either_axis(self):
+        plot_data = plot_frame(build_chart_data(sample_frame()), 'K%', 'ERA')
+        assert plot_data['Column_B'].tolist() == ['John Doe']
+        assert list(plot_data.columns) == ['K%', 'ERA', 'Column_B']
+
+    def test_chart_data_built_once_per_version(self):
+        data = sample_frame()
+        with patch('charts.build_chart_data', wraps=build_chart_data) as mock_build:
+            first = get_chart_data(data)
+            second = get_chart_data(data.copy())
+        assert first is second
+        mock_build.assert_called_once()
+
+
+class TestFigureCache:
+    """Test cases for the cached Plotly figure factory."""
+
+    def test_njit_template_is_registered(self):
+        assert NJIT_TEMPLATE in pio.templates
+        assert pio.templates[NJIT_TEMPLATE].layout.colorway == ('#dc2626',)
+
+    def test_figures_are_cached_per_parameters(self):
+        data = sample_frame()
+        with patch('charts.build_figure', wraps=build_figure) as mock_build:
+            first = get_figure_json(data, 'K%', 'ERA', 'Scatter Plot')
+            second = get_figure_json(data, 'K%', 'ERA', 'Scatter Plot')
+            get_figure_json(data, 'ERA', 'K%', 'Scatter Plot')
+        assert first == second
+        assert mock_build.call_count == 2
+
+    def test_every_chart_type_builds(self):
+        data = sample_frame()
+        for chart_type in ['Scatter Plot', 'Bar Chart', 'Line Chart']:
+            figure = json.loads(get_figure_json(data, 'K%', 'ERA', chart_type))
+            assert figure['data'][0]['y'] is not None
+        bar = pio.from_json(get_figure_json(data, 'K%', 'ERA', 'Bar Chart'))
+        assert bar.layout.xaxis.tickangle == 45
+
+
+class TestTrends:
+    """Test cases for the Trends chart built on the refresh history."""
+
+    def test_no_history_gives_no_figure(self):
+        assert get_trend_figure_json(sample_frame(), 'ERA') is None
+
+    def test_trend_figure_and_changes(self):
+        for day, era in [(1, '3.00'), (8, '2.00')]:
+            frame = pd.DataFrame({'Column_B': ['John Doe', 'Jane Smith'], 'ERA': [era, '4.00']})
+            history.history_store.append(frame, datetime(2025, 3, day, tzinfo=timezone.utc))
+        data = sample_frame()
+
+        figure = pio.from_json(get_trend_figure_json(data, 'ERA', weeks=4))
+        assert {trace.name for trace in figure.data} == {'John Doe', 'Jane Smith'}
+        assert figure.layout.yaxis.title.text == 'ERA'
+
+        changes = trend_changes(get_trend_cube(data, 'ERA', weeks=4), 'ERA')
+        # Lower ERA is better, so the biggest drop comes first
+        assert changes.to_dict() == {'John Doe': -1.0, 'Jane Smith': 0.0}
+        assert get_trend_cube(data, 'ERA', ('Jane Smith',), 4).names == ['Jane Smith']
@@ -0,0 +1,136 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from data_cache import BackgroundLoader, SheetDataCache, current_sheet_data, get_sheet_data, invalidate_sheet_data
+from tests.conftest import FakeClock
+
+
+class TestSheetDataCache:
+    """Test cases for the shared sheet data cache."""
+
+    def test_get_reuses_fresh_data(self):
+        loader = MagicMock(return_value=pd.DataFrame({'K%': ['30%']}))
+        cache = SheetDataCache(loader=loader, ttl_seconds=60, clock=FakeClock())
+        first = cache.get()
+        second = cache.get()
+        assert first is second
+        loader.assert_called_once()
+
+    def test_concurrent_callers_share_one_fetch(self):
+        release = threading.Event()
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            release.wait(timeout=5)
+            return pd.DataFrame({'ERA': ['2.50']})
+
+        cache = SheetDataCache(loader=slow_loader, ttl_seconds=60)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get())) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        assert len(calls) == 1
+        assert len(results) == 5
+        assert all(result is results[0] for result in results)
+
+    def test_expired_data_is_served_while_revalidating(self):
+        clock = FakeClock()
+        old = pd.DataFrame({'ERA': ['2.50']})
+        new = pd.DataFrame({'ERA': ['3.10']})
+        loaded = threading.Event()
+        responses = iter([old, new])
+
+        def loader():
+            data = next(responses)
+            if data is new:
+                loaded.set()
+            return data
+
+        cache = SheetDataCache(loader=loader, ttl_seconds=60, clock=clock)
+        assert cache.get() is old
+        clock.now = 61
+        assert cache.get() is old
+        assert loaded.wait(timeout=5)
+        for _ in range(50):
+            if cache.get() is new:
+                break
+            time.sleep(0.01)
+        assert cache.get() is new
+
+    def test_failed_fetch_returns_none_and_is_not_cached(self):
+        loader = MagicMock(side_effect=[None, pd.DataFrame({'K': ['5']})])
+        cache = SheetDataCache(loader=loader, ttl_seconds=60, clock=FakeClock())
+        assert cache.get() is None
+        assert cache.get() is not None
+        assert loader.call_count == 2
+
+    def test_invalidate_forces_refetch(self):
+        loader = MagicMock(return_value=pd.DataFrame({'K': ['5']}))
+        cache = SheetDataCache(loader=loader, ttl_seconds=60, clock=FakeClock())
+        cache.get()
+        cache.invalidate()
+        assert cache.age() is None
+        cache.get()
+        assert loader.call_count == 2
+
+    @patch('sheets.fetch_sheet_data')
+    def test_module_level_cache_uses_fetch_sheet_data(self, mock_fetch):
+        mock_fetch.return_value = pd.DataFrame({'K': ['5']})
+        assert get_sheet_data() is get_sheet_data()
+        mock_fetch.assert_called_once()
+        invalidate_sheet_data()
+        get_sheet_data()
+        assert mock_fetch.call_count == 2
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestBackgroundLoader:
+    """Test cases for the background sheet loader."""
+
+    def test_loads_on_start_and_when_triggered(self):
+        frames = iter([pd.DataFrame({'ERA': ['2.50']}), pd.DataFrame({'ERA': ['3.10']})])
+        cache = SheetDataCache(loader=lambda: next(frames), ttl_seconds=60)
+        loader = BackgroundLoader(cache, interval_seconds=3600)
+        try:
+            loader.start()
+            loader.start()  # Idempotent
+            assert wait_for(lambda: cache.generation == 1)
+            assert cache.peek()['ERA'].iloc[0] == '2.50'
+            loader.trigger()
+            assert wait_for(lambda: cache.generation == 2)
+            assert cache.peek()['ERA'].iloc[0] == '3.10'
+        finally:
+            loader.stop()
+        assert not loader.is_running()
+
+    def test_unchanged_frame_keeps_generation(self):
+        data = pd.DataFrame({'ERA': ['2.50']})
+        cache = SheetDataCache(loader=lambda: data, ttl_seconds=60)
+        cache.refresh()
+        cache.refresh()
+        assert cache.generation == 1
+        assert not cache.is_refreshing()
+
+    @patch('sheets.fetch_sheet_data')
+    def test_current_sheet_data_waits_only_for_first_load(self, mock_fetch):
+        mock_fetch.return_value = pd.DataFrame({'K': ['5']})
+        first = current_sheet_data()
+        mock_fetch.return_value = pd.DataFrame({'K': ['6']})
+        assert current_sheet_data() is first
+        mock_fetch.assert_called_once()
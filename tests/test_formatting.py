@@ -0,0 +1,75 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from formatting import BLUE, GRAY, GREEN, RED, YELLOW, cell_styles, style_dataframe
+
+
+class TestCellStyles:
+    """Test cases for the vectorized overview formatting rules."""
+
+    def test_rules_follow_stat_direction(self):
+        df = pd.DataFrame({
+            'K%': np.array([85.0, 65.0, 40.0], dtype=np.float32),
+            'ERA': np.array([1.5, 3.5, 6.0], dtype=np.float32),
+            'S%': np.array([75.0, 92.0, 30.0], dtype=np.float32),
+        })
+        styles = cell_styles(df)
+        assert list(styles['K%']) == [GREEN, YELLOW, RED]
+        assert list(styles['ERA']) == [GREEN, YELLOW, RED]
+        # Rates are ranked on the staff, not judged against a fixed band
+        assert list(styles['S%']) == [YELLOW, GREEN, RED]
+
+    def test_csw_is_colored_relative_to_the_staff(self):
+        df = pd.DataFrame({
+            'FB CSW': np.array([25.0, 33.0, 30.8], dtype=np.float32),
+            'SL CSW': np.array([33.0, 25.0, 30.8], dtype=np.float32),
+        })
+        styles = cell_styles(df)
+        assert list(styles['FB CSW']) == [RED, GREEN, YELLOW]
+        assert list(styles['SL CSW']) == [GREEN, RED, YELLOW]
+
+    def test_raw_string_cells_are_parsed(self):
+        df = pd.DataFrame({'Column_B': ['John Doe', 'Jane Smith'], 'K%': ['82%', 'n/a'], 'Velo': ['91', '88']})
+        styles = cell_styles(df)
+        assert list(styles['Column_B']) == ['', '']
+        assert list(styles['K%']) == [GREEN, GRAY]
+        assert list(styles['Velo']) == [BLUE, BLUE]
+
+    def test_missing_values_are_gray(self):
+        df = pd.DataFrame({'K': pd.array([5, None], dtype='Int32'), 'WHIP': [np.nan, 1.1]})
+        styles = cell_styles(df)
+        assert styles.loc[1, 'K'] == GRAY
+        assert styles.loc[0, 'WHIP'] == GRAY
+
+    def test_style_dataframe_renders(self):
+        df = pd.DataFrame({'Column_B': ['John Doe'], 'ERA': np.array([2.5], dtype=np.float32)})
+        html = style_dataframe(df).to_html()
+        assert '2.50' in html
+        assert '#22c55e' in html  # The only pitcher is the staff's best
+
+
+    def test_colors_are_relative_to_the_staff(self):
+        df = pd.DataFrame({
+            'Column_B': ['A', 'B', 'C', 'D', 'Staff Total:'],
+            'k/9': np.array([14.0, 12.0, 9.0, 7.0, 10.5], dtype=np.float32),
+            'ERA': np.array([5.0, 6.0, 7.0, 8.0, 6.5], dtype=np.float32),
+        })
+        styles = cell_styles(df)
+        # k/9 of 12 would be red on an absolute 0-100 scale; it is second best here
+        assert list(styles['k/9']) == [GREEN, GREEN, YELLOW, RED, BLUE]
+        assert list(styles['ERA']) == [GREEN, GREEN, YELLOW, RED, BLUE]
+
+
+class TestOverviewCache:
+    """Test cases for reusing overview styles across reruns."""
+
+    def test_styles_computed_once_per_data_version(self):
+        df = pd.DataFrame({'Column_B': ['John Doe'], 'ERA': np.array([2.5], dtype=np.float32)})
+        with patch('formatting.cell_styles', wraps=cell_styles) as mock_styles:
+            style_dataframe(df).to_html()
+            style_dataframe(df.copy()).to_html()
+            assert mock_styles.call_count == 1
+            style_dataframe(df.assign(ERA=np.array([5.0], dtype=np.float32))).to_html()
+            assert mock_styles.call_count == 2
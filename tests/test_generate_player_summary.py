@@ -8,15 +8,19 @@ def test_generate_player_summary_success():
     model_name = 'gpt-4'
     mock_response = MagicMock()
     mock_response.choices = [MagicMock(message=MagicMock(content='John Doe is pitching well.'))]
-    with patch('openai.ChatCompletion.create', return_value=mock_response) as mock_create:
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = mock_response
+    with patch('summaries.openai_manager.get_client', return_value=mock_client):
         summary = generate_player_summary(player_stats, api_key, model_name)
         assert 'John Doe is pitching well.' in summary
-        mock_create.assert_called_once()
+        mock_client.chat.completions.create.assert_called_once()
 
 def test_generate_player_summary_api_error():
     player_stats = {'Player': 'Jane Smith', 'K%': 28, 'ERA': 3.1}
     api_key = 'sk-test'
     model_name = 'gpt-4'
-    with patch('openai.ChatCompletion.create', side_effect=Exception('API error')):
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = Exception('API error')
+    with patch('summaries.openai_manager.get_client', return_value=mock_client):
         summary = generate_player_summary(player_stats, api_key, model_name)
         assert 'Error generating summary' in summary
@@ -0,0 +1,97 @@
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from history import HistoryStore, backfill, stat_rows, trend_frame
+from snapshots import SnapshotStore
+
+
+def week_frame(era, whiff='30%'):
+    return pd.DataFrame({
+        'Column_B': ['John Doe', 'Jane Smith', 'Staff Total:'],
+        'ERA': [str(era), str(era + 1), '9.99'],
+        'Whiff%': [whiff, '', '25%'],
+    })
+
+
+def on(day):
+    return datetime(2025, 3, day, 18, tzinfo=timezone.utc)
+
+
+class TestHistoryStore:
+    """Test cases for the historical stat store."""
+
+    def test_stat_rows_skip_totals_and_blanks(self):
+        rows = stat_rows(week_frame(2.5))
+        assert set(rows['player']) == {'john doe', 'jane smith'}
+        assert len(rows) == 3
+        assert rows.loc[rows['stat'] == 'Whiff%', 'value'].tolist() == [30.0]
+
+    def test_query_returns_player_date_stat_cube(self, tmp_path):
+        store = HistoryStore(tmp_path / 'history.sqlite3')
+        store.append(week_frame(2.5), on(1))
+        store.append(week_frame(3.0, '35%'), on(8))
+
+        cube = store.query()
+
+        assert cube.names == ['Jane Smith', 'John Doe']
+        assert cube.stats == ['ERA', 'Whiff%']
+        assert list(cube.dates) == [pd.Timestamp('2025-03-01'), pd.Timestamp('2025-03-08')]
+        assert cube.values.shape == (2, 2, 2)
+        np.testing.assert_array_equal(cube.values[1, :, 1], [30.0, 35.0])
+        assert np.isnan(cube.values[0, :, 1]).all()
+
+    def test_query_filters_players_stats_and_dates(self, tmp_path):
+        store = HistoryStore(tmp_path / 'history.sqlite3')
+        for day, era in [(1, 2.5), (8, 3.0), (15, 3.5)]:
+            store.append(week_frame(era), on(day))
+
+        cube = store.query(players=['JANE SMITH', 'Nobody'], stats=['ERA', 'FIP'], start=date(2025, 3, 5))
+        assert cube.players == ['jane smith'] and cube.stats == ['ERA']
+        np.testing.assert_array_equal(cube.values[0, :, 0], [4.0, 4.5])
+
+        recent = store.recent(1, stats=['ERA'])
+        assert list(recent.dates) == [pd.Timestamp('2025-03-15')]
+        assert trend_frame(recent, 'ERA').to_dict('list') == {'Jane Smith': [4.5], 'John Doe': [3.5]}
+
+    def test_same_day_refresh_replaces_values(self, tmp_path):
+        store = HistoryStore(tmp_path / 'history.sqlite3')
+        assert store.append(week_frame(2.5), on(1)) == 3
+        assert store.append(week_frame(2.5), on(1)) == 0  # Unchanged, skipped
+        store.append(week_frame(2.0, ''), datetime(2025, 3, 1, 23, tzinfo=timezone.utc))
+
+        cube = store.query()
+        assert store.snapshot_dates() == [date(2025, 3, 1)]
+        assert len(store) == 2
+        assert cube.values[1, 0, 0] == 2.0
+        assert np.isnan(cube.values[:, :, 1]).all()
+
+    def test_unchanged_sheet_is_not_recorded_on_later_days(self, tmp_path):
+        store = HistoryStore(tmp_path / 'history.sqlite3')
+        store.append(week_frame(2.5), on(1))
+        assert store.append(week_frame(2.5), on(2)) == 0
+        store.append(week_frame(3.0), on(8))
+        assert store.snapshot_dates() == [date(2025, 3, 1), date(2025, 3, 8)]
+
+    def test_same_day_refresh_drops_removed_columns(self, tmp_path):
+        store = HistoryStore(tmp_path / 'history.sqlite3')
+        store.append(week_frame(2.5), on(1))
+        store.append(week_frame(2.5).drop(columns=['Whiff%']), datetime(2025, 3, 1, 23, tzinfo=timezone.utc))
+
+        assert len(store) == 2
+        assert np.isnan(store.query(stats=['Whiff%']).values).all()
+
+    def test_empty_store(self, tmp_path):
+        store = HistoryStore(tmp_path / 'history.sqlite3')
+        assert store.latest_date() is None
+        assert store.recent(4).values.shape == (0, 0, 0)
+
+    def test_backfill_from_snapshots(self, tmp_path):
+        snapshots = SnapshotStore(tmp_path / 'snapshots')
+        snapshots.save(week_frame(2.5), fetched_at=on(1))
+        snapshots.save(week_frame(3.0), fetched_at=on(8))
+        store = HistoryStore(tmp_path / 'history.sqlite3')
+
+        assert backfill(store, snapshots) == 6
+        assert store.snapshot_dates() == [date(2025, 3, 1), date(2025, 3, 8)]
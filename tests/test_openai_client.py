@@ -0,0 +1,62 @@
+from unittest.mock import MagicMock
+
+import openai
+import pytest
+
+from openai_client import CircuitBreaker, CircuitOpenError, OpenAIClientManager
+from tests.conftest import FakeClock
+
+
+def rate_limit_error():
+    return openai.RateLimitError('Rate limit reached', response=MagicMock(status_code=429, headers={}), body=None)
+
+
+class TestOpenAIClientManager:
+    """Test cases for the pooled OpenAI client manager."""
+
+    def test_one_client_per_api_key(self):
+        manager = OpenAIClientManager()
+        assert manager.get_client('sk-a') is manager.get_client('sk-a')
+        assert manager.get_client('sk-a') is not manager.get_client('sk-b')
+        assert manager.get_client('sk-a').max_retries == 0
+        manager.reset()
+
+    def test_retries_rate_limits_with_backoff(self):
+        sleeps = []
+        manager = OpenAIClientManager(sleep=sleeps.append)
+        request = MagicMock(side_effect=[rate_limit_error(), rate_limit_error(), 'summary'])
+        assert manager.call('sk-test', request) == 'summary'
+        assert request.call_count == 3
+        assert len(sleeps) == 2 and sleeps[1] > 0
+        manager.reset()
+
+    def test_non_retryable_errors_are_raised_immediately(self):
+        manager = OpenAIClientManager(sleep=lambda _: None)
+        request = MagicMock(side_effect=ValueError('bad request'))
+        with pytest.raises(ValueError):
+            manager.call('sk-test', request)
+        request.assert_called_once()
+        manager.reset()
+
+    def test_open_breaker_fails_fast(self):
+        manager = OpenAIClientManager(max_attempts=1, sleep=lambda _: None)
+        request = MagicMock(side_effect=rate_limit_error())
+        for _ in range(5):
+            with pytest.raises(openai.RateLimitError):
+                manager.call('sk-test', request)
+        with pytest.raises(CircuitOpenError):
+            manager.call('sk-test', request)
+        assert request.call_count == 5
+        manager.reset()
+
+
+def test_breaker_half_opens_after_reset_window():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.allow_request()
+    clock.now = 31
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert not breaker.is_open
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from players import Player, PlayerRegistry, get_registry, normalize_name
+from sheets import format_stats, parse_stat_columns
+from summaries import summary_key
+from summary_jobs import player_stats_rows
+
+
+def make_frame():
+    return pd.DataFrame({
+        'Column_B': ['John Doe', ' jane  SMITH ', 'Staff Total:', np.nan, 'John Doe'],
+        'ERA': [2.5, 3.1, 2.8, np.nan, 9.9],
+    })
+
+
+class TestPlayerRegistry:
+    """Test cases for the player name registry."""
+
+    def test_lookup_ignores_case_whitespace_and_colons(self):
+        registry = PlayerRegistry(make_frame())
+        assert registry.find('JANE SMITH') == 1
+        assert registry.find('Jane Smith:') == 1
+        assert registry.find('john doe') == 0  # First row wins for duplicate names
+        assert registry.find('Nobody') is None
+
+    def test_totals_are_kept_out_of_player_lookups(self):
+        registry = PlayerRegistry(make_frame())
+        assert 'Staff Total' not in registry
+        assert registry.find_total('staff total') == 2
+        assert registry.display_names == ['John Doe', 'jane  SMITH', 'John Doe']
+        assert registry.get('Jane Smith')['ERA'] == 3.1
+
+    def test_registry_is_shared_per_data_version(self):
+        data = make_frame()
+        assert get_registry(data) is get_registry(data)
+        assert get_registry(data.copy()) is get_registry(data)
+
+    def test_frame_without_name_column(self):
+        registry = PlayerRegistry(pd.DataFrame({'ERA': [1.0]}))
+        assert registry.name_col is None
+        assert registry.display_names == [] and registry.find('x') is None
+
+
+class TestPlayer:
+    """Test cases for the slotted Player view."""
+
+    def test_player_reads_from_shared_store(self):
+        registry = PlayerRegistry(make_frame())
+        player = registry.get('Jane Smith')
+        assert player.store is registry.get('John Doe').store
+        assert player.get_stat('ERA') == 3.1 and player['ERA'] == 3.1 and player.ERA == 3.1
+        assert player.get_stat('WHIP') is None and player['WHIP'] is None
+        assert player.stats == {'Column_B': ' jane  SMITH ', 'ERA': 3.1}
+
+    def test_player_has_no_per_instance_dict(self):
+        player = Player.from_stats({'K%': 32.0, 'Out% RHB': 0.6})
+        assert not hasattr(player, '__dict__')
+        assert player['Out% RHB'] == 0.6
+        with pytest.raises(AttributeError):
+            player.WHIP  # pylint: disable=pointless-statement
+
+    def test_nullable_int_stats_match_pregenerated_rows(self):
+        data = parse_stat_columns(pd.DataFrame({
+            'Column_B': ['John Doe', 'Jane Smith'], 'W': ['4', ''], 'ERA': ['2.50', '3.10'],
+        }))
+        assert str(data['W'].dtype) == 'Int32'
+        page_stats = format_stats(PlayerRegistry(data).get('John Doe').stats, data)
+        job_stats = dict(player_stats_rows(data))['John Doe']
+        assert page_stats == job_stats
+        assert page_stats['W'] == '4'
+        assert summary_key(page_stats, 'model') == summary_key(job_stats, 'model')
+
+
+def test_normalize_name():
+    assert normalize_name('  Staff   Total: ') == 'staff total'
@@ -0,0 +1,181 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+import charts
+import data_cache
+import formatting
+import history
+import players
+import refresh_daemon
+from refresh_daemon import CronSchedule, IntervalSchedule, parse_schedule, refresh_sheet, validate_sheet
+
+
+def staff_frame(players_count=3):
+    names = [f'Pitcher {i}' for i in range(players_count)] + ['Staff Total:']
+    stats = {col: [f'{i + 1}.{j}' for i in range(players_count + 1)] for j, col in enumerate(
+        ['ERA', 'WHIP', 'K%', 'BB%', 'IP', 'BAA'])}
+    return pd.DataFrame({'Column_B': names, **stats})
+
+
+class TestSchedules:
+    """Test cases for interval and cron schedules."""
+
+    def test_parse_interval(self):
+        assert parse_schedule('300').seconds == 300
+        assert parse_schedule('15m').seconds == 900
+        assert parse_schedule(' 6h ').seconds == 6 * 3600
+        assert isinstance(parse_schedule('0 6 * * 1'), CronSchedule)
+
+    def test_cron_next_after(self):
+        sunday_noon = datetime(2025, 10, 26, 12, 0)
+        assert CronSchedule('0 6 * * 1').next_after(sunday_noon) == datetime(2025, 10, 27, 6, 0)
+        assert CronSchedule('*/15 * * * *').next_after(datetime(2025, 10, 26, 10, 7)) == datetime(2025, 10, 26, 10, 15)
+        assert CronSchedule('30 9 1 * *').next_after(sunday_noon) == datetime(2025, 11, 1, 9, 30)
+        # Restricted day-of-month and day-of-week: either one matches
+        assert CronSchedule('0 0 1 * 0,7').next_after(datetime(2025, 10, 27)) == datetime(2025, 11, 1)
+
+    def test_invalid_schedules_rejected(self):
+        for expression in ['0 6 * *', '61 * * * *', '0 6 * * 8', '-5']:
+            with pytest.raises(ValueError):
+                parse_schedule(expression)
+
+    def test_interval_next_after(self):
+        assert IntervalSchedule(90).next_after(datetime(2025, 1, 1)) == datetime(2025, 1, 1, 0, 1, 30)
+
+
+class TestValidation:
+    """Test cases for refresh validation."""
+
+    def test_valid_sheet_has_no_problems(self):
+        assert validate_sheet(staff_frame()) == []
+
+    def test_problems_reported(self):
+        assert validate_sheet(None) == ['sheet is empty']
+        assert validate_sheet(pd.DataFrame({'ERA': ['2.50']})) == ['no player name column']
+        assert validate_sheet(staff_frame()[['Column_B', 'ERA']]) == ['only 1 numeric stat columns']
+        assert validate_sheet(staff_frame(1), previous=staff_frame(10)) == ['player count dropped from 10 to 1']
+
+
+class TestRefreshSheet:
+    """Test cases for the refresh pipeline."""
+
+    @patch('sheets.fetch_sheet_data')
+    def test_refresh_snapshots_and_prewarms(self, mock_fetch):
+        data = staff_frame()
+        mock_fetch.return_value = data
+
+        assert refresh_sheet() is data
+
+        assert len(data_cache.snapshot_store.list_snapshots()) == 1
+        assert history.history_store.query().names == ['Pitcher 0', 'Pitcher 1', 'Pitcher 2']
+        assert len(players.registry_cache) == 1
+        assert len(formatting.overview_cache) == 1
+        assert len(charts.chart_data_cache) == 1 and len(charts.figure_cache) == 1
+
+    @patch('sheets.fetch_sheet_data')
+    def test_rejected_refresh_keeps_previous_data(self, mock_fetch):
+        cache = data_cache.sheet_cache
+        cache.loader = refresh_sheet
+        mock_fetch.return_value = staff_frame()
+        good = cache.refresh()
+        mock_fetch.return_value = staff_frame()[['Column_B']]
+
+        assert cache.refresh() is good
+        assert len(data_cache.snapshot_store.list_snapshots()) == 1
+
+    def test_offline_refresh_reuses_unchanged_snapshot(self, monkeypatch):
+        monkeypatch.setenv('OFFLINE_MODE', '1')
+        monkeypatch.setattr(refresh_daemon, '_last_snapshot', None)
+        data_cache.snapshot_store.save(staff_frame())
+        cache = data_cache.sheet_cache
+        cache.loader = refresh_sheet
+        generation = cache.generation
+        with patch('sheets.fetch_sheet_data') as mock_fetch:
+            first = cache.refresh()
+            assert cache.refresh() is first
+        mock_fetch.assert_not_called()
+        assert cache.generation == generation + 1
+
+    @patch('sheets.fetch_sheet_data')
+    def test_standalone_daemon_rejects_partial_sheet(self, mock_fetch):
+        # Nothing is swapped into sheet_cache when running under run_forever
+        mock_fetch.return_value = staff_frame(20)
+        assert refresh_sheet() is not None
+        mock_fetch.return_value = staff_frame(2)
+
+        assert refresh_sheet() is None
+        assert data_cache.sheet_cache.peek() is None
+        assert len(data_cache.snapshot_store.list_snapshots()) == 1
+
+    @patch('sheets.fetch_sheet_data')
+    def test_restarted_daemon_compares_with_latest_snapshot(self, mock_fetch):
+        data_cache.snapshot_store.save(staff_frame(20))
+        mock_fetch.return_value = staff_frame(2)
+        assert refresh_sheet() is None
+
+    @patch('sheets.fetch_sheet_data')
+    def test_persistent_roster_shrink_is_accepted(self, mock_fetch):
+        mock_fetch.return_value = staff_frame(20)
+        refresh_sheet()
+        mock_fetch.return_value = staff_frame(2)
+
+        assert refresh_sheet(clock=lambda: 1000.0) is None
+        assert refresh_sheet(clock=lambda: 1000.0 + refresh_daemon.SHRINK_CONFIRM_SECONDS - 1) is None
+        accepted = refresh_sheet(clock=lambda: 1000.0 + refresh_daemon.SHRINK_CONFIRM_SECONDS)
+
+        assert len(accepted) == 3
+        assert len(data_cache.snapshot_store.list_snapshots()) == 2
+
+    @patch('sheets.fetch_sheet_data')
+    def test_weekly_schedule_retries_a_pending_shrink_within_minutes(self, mock_fetch):
+        schedule = refresh_daemon.ShrinkRetrySchedule(CronSchedule('0 6 * * 1'))
+        monday = datetime(2025, 10, 27, 6, 0)
+        assert schedule.next_after(monday) == datetime(2025, 11, 3, 6, 0)
+        mock_fetch.return_value = staff_frame(20)
+        refresh_sheet()
+        mock_fetch.return_value = staff_frame(2)
+
+        assert refresh_sheet() is None
+        assert schedule.next_after(monday) == datetime(2025, 10, 27, 6, 5)
+
+    @patch('sheets.fetch_sheet_data')
+    def test_single_run_confirms_shrink_before_exiting(self, mock_fetch):
+        mock_fetch.return_value = staff_frame(20)
+        refresh_sheet()
+        mock_fetch.return_value = staff_frame(2)
+        now, sleeps = [0.0], []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        data = refresh_daemon.refresh_once(refresh=lambda: refresh_sheet(clock=lambda: now[0]), sleep=sleep)
+
+        assert len(data) == 3
+        assert sum(sleeps) == refresh_daemon.SHRINK_CONFIRM_SECONDS
+
+    @patch('sheets.fetch_sheet_data')
+    def test_allow_shrink_overrides_drop_check(self, mock_fetch, monkeypatch):
+        mock_fetch.return_value = staff_frame(20)
+        refresh_sheet()
+        monkeypatch.setenv('REFRESH_ALLOW_SHRINK', '1')
+        mock_fetch.return_value = staff_frame(2)
+        assert refresh_sheet() is not None
+
+
+def test_run_forever_refreshes_on_schedule():
+    calls, sleeps = [], []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 2:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        refresh_daemon.run_forever(
+            IntervalSchedule(60), refresh=lambda: calls.append(1), clock=lambda: datetime(2025, 1, 1), sleep=sleep,
+        )
+    assert len(calls) == 2 and sleeps == [60, 60]
@@ -1,14 +1,20 @@
 import pytest
 from unittest.mock import patch, MagicMock
 import pandas as pd
-from sheets import fetch_sheet_data
+import numpy as np
+
+from sheets import (
+    GRID_TTL_SECONDS, SheetSync, SheetsClient, column_letter, column_number, diff_frames, fetch_ranges,
+    fetch_sheet_data, format_stats, grid_ranges, last_sheet_diff, normalize_headers, parse_stat_columns, split_range,
+    values_to_dataframe,
+)
 
 
 class TestSheetsModule:
     """Test cases for the sheets module."""
 
-    @patch('sheets.service_account.Credentials.from_service_account_file')
-    @patch('sheets.build')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('googleapiclient.discovery.build')
     def test_fetch_sheet_data_success(self, mock_build, mock_creds):
         """Test successful data fetching from Google Sheets."""
         # Mock the credentials
@@ -41,8 +47,8 @@ class TestSheetsModule:
             assert col in result.columns
         assert result.iloc[0]['Player'] == 'John Doe'
 
-    @patch('sheets.service_account.Credentials.from_service_account_file')
-    @patch('sheets.build')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('googleapiclient.discovery.build')
     def test_fetch_sheet_data_empty_values(self, mock_build, mock_creds):
         """Test handling of empty sheet data."""
         mock_creds.return_value = MagicMock()
@@ -57,10 +63,292 @@ class TestSheetsModule:
         result = fetch_sheet_data()
         assert result is None
 
-    @patch('sheets.service_account.Credentials.from_service_account_file')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
     def test_fetch_sheet_data_exception(self, mock_creds):
         """Test exception handling in data fetching."""
         mock_creds.side_effect = Exception("Credentials error")
         
         result = fetch_sheet_data()
-        assert result is None
\ No newline at end of file
+        assert result is None
+
+class TestSheetsClient:
+    """Test cases for the reusable Sheets client holder."""
+
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('googleapiclient.discovery.build')
+    def test_credentials_and_service_built_once(self, mock_build, mock_creds):
+        """Repeated fetches reuse the same credentials and service."""
+        mock_creds.return_value = MagicMock()
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        mock_service.spreadsheets().values().get().execute.return_value = {
+            'values': [['Player'], ['John Doe']]
+        }
+
+        assert fetch_sheet_data() is not None
+        assert fetch_sheet_data() is not None
+
+        mock_creds.assert_called_once()
+        assert sorted(call.args[0] for call in mock_build.call_args_list) == ['drive', 'sheets']
+
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('googleapiclient.discovery.build')
+    def test_expired_token_refreshed_before_request(self, mock_build, mock_creds):
+        """An invalid token is refreshed once, then reused while valid."""
+        creds = MagicMock()
+        creds.valid = False
+
+        def refresh(_request):
+            creds.valid = True
+
+        creds.refresh.side_effect = refresh
+        mock_creds.return_value = creds
+        client = SheetsClient(credentials_file='unused.json')
+
+        client.get_values('sheet-id', 'Dash!A1:B2')
+        client.get_values('sheet-id', 'Dash!A1:B2')
+
+        creds.refresh.assert_called_once()
+        assert {'credentials', 'discovery', 'token', 'request'} <= set(client.timings)
+
+
+class TestSheetSync:
+    """Test cases for change-detecting sheet sync."""
+
+    def make_client(self, *responses, version=None):
+        client = MagicMock()
+        client.get_file_version.return_value = version
+        client.get_grid_properties.return_value = {}
+        client.get_values.side_effect = [{'values': values} for values in responses]
+        client.format_timings.return_value = ''
+        return client
+
+    def test_unchanged_drive_version_skips_download(self):
+        values = [['', 'ERA'], ['John Doe', '2.50']]
+        client = self.make_client(values, version='12')
+        sync = SheetSync(client=client)
+
+        first = sync.sync()
+        second = sync.sync()
+
+        assert first.changed and not second.changed
+        assert second.data is first.data
+        client.get_values.assert_called_once()
+
+    def test_unchanged_values_reuse_dataframe(self):
+        values = [['', 'ERA'], ['John Doe', '2.50']]
+        client = self.make_client(values, [row[:] for row in values])
+        sync = SheetSync(client=client)
+
+        first = sync.sync()
+        second = sync.sync()
+
+        assert not second.changed
+        assert second.data is first.data
+        assert client.get_values.call_count == 2
+
+    def test_changed_values_report_diff(self):
+        old = [['', 'ERA', 'K'], ['John Doe', '2.50', '10'], ['Jane Smith', '3.10', '8']]
+        new = [['', 'ERA', 'K'], ['John Doe', '2.50', '12'], ['Sam Lee', '4.00', '3']]
+        sync = SheetSync(client=self.make_client(old, new))
+
+        sync.sync()
+        result = sync.sync()
+
+        assert result.changed
+        assert result.diff.added_rows == ['Sam Lee']
+        assert result.diff.removed_rows == ['Jane Smith']
+        assert result.diff.changed_cells == {'John Doe': {'K': (10, 12)}}
+        assert result.diff.changed_players == ['Sam Lee', 'John Doe']
+
+    def test_last_sheet_diff_only_for_the_synced_frame(self):
+        old = [['', 'ERA'], ['John Doe', '2.50']]
+        new = [['', 'ERA'], ['John Doe', '3.00']]
+        with patch('sheets.sheet_sync', SheetSync(client=self.make_client(old, new))):
+            first = fetch_sheet_data()
+            assert last_sheet_diff(first) is None  # First load: everything is new
+            second = fetch_sheet_data()
+            assert last_sheet_diff(second).changed_players == ['John Doe']
+            assert last_sheet_diff(second.copy()) is None
+
+
+class TestIngest:
+    """Test cases for header normalization and ragged row ingest."""
+
+    def test_normalize_headers_labels_blanks_and_dedupes(self):
+        headers = normalize_headers(['', 'Team', '', 'ERA', 'ERA', 'K', 'ERA', '', 'ERA'])
+        assert headers == [
+            'Column_B', 'Team', 'Column_D', 'ERA', 'ERA_1', 'K', 'ERA_2', 'Column_I', 'ERA_3',
+        ]
+
+    def test_short_header_row_padded_to_label_columns(self):
+        assert normalize_headers(['ERA']) == ['ERA'] + [f'Column_{c}' for c in 'CDEFGHI']
+
+    def test_ragged_rows_padded_and_trimmed(self):
+        values = [['', 'ERA', 'K'], ['John Doe'], ['Jane Smith', '3.10', '8', 'extra']]
+        data = values_to_dataframe(values)
+        assert data.shape == (2, 8)
+        assert data.loc[0, 'ERA'] == '' and data.loc[1, 'K'] == '8'
+
+
+class TestRangeDiscovery:
+    """Test cases for discovering a tab's extent from its grid properties."""
+
+    def test_a1_helpers(self):
+        assert [column_letter(n) for n in (1, 26, 27, 69)] == ['A', 'Z', 'AA', 'BQ']
+        assert column_number('BQ') == 69
+        assert split_range('Dash!B1:BQ22') == ('Dash', 'B', 1)
+        assert grid_ranges('Dash', 'B', 1, 30, 70) == ['Dash!B1:BR30']
+        assert grid_ranges('Log', 'A', 1, 25, 3, chunk_rows=10) == ['Log!A1:C10', 'Log!A11:C20', 'Log!A21:C25']
+
+    def test_discovered_range_cached_between_refreshes(self):
+        now = [0.0]
+        client = MagicMock()
+        client.get_file_version.return_value = None
+        client.get_grid_properties.side_effect = [{'Dash': (40, 70)}, {'Dash': (41, 70)}]
+        client.get_values.side_effect = [
+            {'values': [['', 'ERA'], ['John Doe', '2.50']]},
+            {'values': [['', 'ERA'], ['John Doe', '2.75']]},
+            {'values': [['', 'ERA'], ['John Doe', '3.00']]},
+        ]
+        client.format_timings.return_value = ''
+        sync = SheetSync(range_name='Dash!B1:BQ22', client=client, clock=lambda: now[0])
+
+        sync.sync()
+        now[0] = 60
+        sync.sync()
+        now[0] = GRID_TTL_SECONDS + 1
+        sync.sync()
+
+        assert client.get_grid_properties.call_count == 2
+        ranges = [call.args[1] for call in client.get_values.call_args_list]
+        assert ranges == ['Dash!B1:BR40', 'Dash!B1:BR40', 'Dash!B1:BR41']
+
+    def test_large_tab_fetched_in_chunks(self):
+        client = MagicMock()
+        client.get_file_version.return_value = None
+        client.get_grid_properties.return_value = {'Log': (12000, 3)}
+        client.get_values.side_effect = [
+            {'values': [['Pitch', 'Velo'], ['FB', '91']]}, {'values': [['SL', '82']]}, {},
+        ]
+        client.format_timings.return_value = ''
+
+        data = SheetSync(range_name='Log!A1:C2', client=client).sync().data
+
+        assert client.get_values.call_count == 3
+        assert data['Pitch'].tolist() == ['FB', 'SL']
+
+
+class TestFetchRanges:
+    """Test cases for multi-range, multi-spreadsheet fetches."""
+
+    def test_one_batch_request_per_spreadsheet(self):
+        client = MagicMock()
+        responses = {
+            'team-a': [[['', 'ERA'], ['John Doe', '2.50']], [['', 'AVG'], ['John Doe', '.300']]],
+            'team-b': [[]],
+        }
+        client.batch_get_values.side_effect = lambda spreadsheet_id, ranges: responses[spreadsheet_id]
+
+        frames = fetch_ranges(
+            [('team-a', 'Pitching!A1:C9'), ('team-a', 'Hitting!A1:C9'), ('team-b', 'Dash!A1:C9')],
+            client=client,
+        )
+
+        assert client.batch_get_values.call_count == 2
+        client.batch_get_values.assert_any_call('team-a', ['Pitching!A1:C9', 'Hitting!A1:C9'])
+        assert frames[('team-a', 'Pitching!A1:C9')]['ERA'].iloc[0] == pytest.approx(2.5)
+        assert frames[('team-a', 'Hitting!A1:C9')]['AVG'].iloc[0] == pytest.approx(0.3)
+        assert frames[('team-b', 'Dash!A1:C9')] is None
+
+    def test_failed_spreadsheet_maps_to_none(self):
+        client = MagicMock()
+        client.batch_get_values.side_effect = RuntimeError('boom')
+        assert fetch_ranges([('team-a', 'Dash!A1:B2')], client=client) == {('team-a', 'Dash!A1:B2'): None}
+
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('googleapiclient.discovery.build')
+    def test_client_batch_get_returns_values_in_order(self, mock_build, mock_creds):
+        mock_creds.return_value = MagicMock()
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        mock_service.spreadsheets().values().batchGet().execute.return_value = {
+            'valueRanges': [{'values': [['a']]}, {'range': 'Empty!A1'}]
+        }
+        client = SheetsClient(credentials_file='unused.json')
+        assert client.batch_get_values('sheet-id', ['A!A1', 'Empty!A1']) == [[['a']], []]
+
+
+def test_diff_frames_new_column_touches_every_player():
+    old = pd.DataFrame({'Column_B': ['John Doe', 'Jane Smith'], 'ERA': ['2.50', '3.10']})
+    new = old.assign(WHIP=['1.10', '1.30'])
+    diff = diff_frames(old, new)
+    assert diff.changed_cells == {}
+    assert diff.changed_players == ['John Doe', 'Jane Smith']
+
+
+class TestParseStatColumns:
+    """Test cases for typed stat ingest."""
+
+    values = [
+        ['', '', 'ERA', 'K%', 'IP', 'K', 'K:BB', 'BAA'],
+        ['John Doe', 'FB', '2.50', '32.5%', '5.1', '10', '3:1', '.250'],
+        ['Jane Smith', 'SL', '', '28%', '12.2', '8', '2.5', '-'],
+    ]
+
+    def test_columns_get_typed_dtypes(self):
+        data = parse_stat_columns(values_to_dataframe(self.values))
+        assert data['Column_B'].dtype == 'category'
+        assert data['ERA'].dtype == np.float32
+        assert data['K%'].dtype == np.float32
+        assert data['K'].dtype == 'Int32'
+        assert data['K:BB'].iloc[0] == 3.0
+        assert np.isnan(data['ERA'].iloc[1]) and np.isnan(data['BAA'].iloc[1])
+
+    def test_innings_thirds_are_converted(self):
+        data = parse_stat_columns(values_to_dataframe(self.values))
+        assert data['IP'].iloc[0] == np.float32(5 + 1 / 3)
+        assert data['IP'].iloc[1] == np.float32(12 + 2 / 3)
+
+    def test_decimal_innings_are_kept_as_written(self):
+        # This sheet writes IP as decimals, not thirds (values from the live dashboard)
+        data = parse_stat_columns(pd.DataFrame({
+            'Column_B': ['Jones', 'Sybirski', 'Staff Total:'], 'IP': ['13.3', '9.3', '123.33'],
+        }))
+        assert data.attrs['innings_columns'] == []
+        assert data['IP'].tolist() == pytest.approx([13.3, 9.3, 123.33])
+        assert format_stats(data.iloc[0].to_dict(), data)['IP'] == '13.30'
+
+    def test_metadata_formats_values_back(self):
+        data = parse_stat_columns(values_to_dataframe(self.values))
+        assert data.attrs['percent_columns'] == ['K%']
+        formatted = format_stats(data.iloc[0].to_dict(), data)
+        assert formatted['K%'] == '32.5%'
+        assert formatted['IP'] == '5.1'
+        assert formatted['ERA'] == '2.50'
+        assert format_stats(data.iloc[1].to_dict(), data)['ERA'] == ''
+
+    def test_values_format_back_with_the_sheets_precision(self):
+        data = parse_stat_columns(pd.DataFrame({
+            'Column_B': ['Jones', 'Sybirski'],
+            'BAA': ['0.213', '0.246'], 'Baa dif': ['0.084', '-0.010'], 'OS S%': ['55.74%', '50.00%'],
+        }))
+        formatted = format_stats(data.iloc[0].to_dict(), data)
+        assert formatted['BAA'] == '0.213' and formatted['Baa dif'] == '0.084'
+        assert formatted['OS S%'] == '55.74%'
+
+    def test_zero_denominator_ratio_is_missing_not_text(self):
+        data = parse_stat_columns(pd.DataFrame({'Column_B': ['A', 'B'], 'K:BB': ['3:1', '5:0']}))
+        assert data['K:BB'].dtype == np.float32
+        assert data['K:BB'].iloc[0] == 3.0 and np.isnan(data['K:BB'].iloc[1])
+
+    def test_text_columns_become_categorical(self):
+        data = parse_stat_columns(pd.DataFrame({'Column_B': ['A', 'B'], 'Hand': ['R', 'L']}))
+        assert data['Hand'].dtype == 'category'
+
+
+def test_data_version_tracks_content():
+    from sheets import data_version
+    df = pd.DataFrame({'Column_B': ['John Doe'], 'ERA': ['2.50']})
+    assert data_version(df) == data_version(df.copy())
+    assert data_version(df) != data_version(df.assign(ERA=['3.10']))
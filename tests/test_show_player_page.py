@@ -18,5 +18,5 @@ def test_show_player_page_runs():
          patch('streamlit.dataframe'), \
          patch('streamlit.spinner'), \
          patch('streamlit.write'), \
-         patch('app.generate_player_summary', return_value='AI summary here.'):
+         patch('views.player.generate_player_summary', return_value='AI summary here.'):
         show_player_page(df, player_name_col, player_name, api_key, model_name)
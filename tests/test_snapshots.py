@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_cache
+from sheets import iter_typed_chunks
+from snapshots import SnapshotStore, ingest_range_to_dataset, read_dataset
+
+
+def sample_frame(era='2.50'):
+    return pd.DataFrame({'Column_B': ['John Doe', 'Jane Smith'], 'ERA': [era, '3.10']})
+
+
+class TestSnapshotStore:
+    """Test cases for the local Arrow snapshot store."""
+
+    def test_save_and_load_latest_round_trip(self, tmp_path):
+        store = SnapshotStore(tmp_path)
+        fetched_at = datetime(2025, 10, 27, 19, 30, tzinfo=timezone.utc)
+        store.save(sample_frame(), fetched_at=fetched_at)
+
+        data, loaded_at = store.load_latest()
+
+        pd.testing.assert_frame_equal(data, sample_frame(), check_dtype=False)
+        assert loaded_at == fetched_at
+
+    def test_unchanged_data_is_not_written_twice(self, tmp_path):
+        store = SnapshotStore(tmp_path)
+        assert store.save(sample_frame()) is not None
+        assert SnapshotStore(tmp_path).save(sample_frame()) is None
+        assert len(store.list_snapshots()) == 1
+
+    def test_snapshots_are_keyed_by_fetch_time(self, tmp_path):
+        store = SnapshotStore(tmp_path)
+        first = datetime(2025, 10, 20, tzinfo=timezone.utc)
+        store.save(sample_frame('2.50'), fetched_at=first)
+        store.save(sample_frame('1.90'), fetched_at=first + timedelta(days=7))
+
+        assert [fetched_at for fetched_at, _ in store.list_snapshots()] == [first, first + timedelta(days=7)]
+        assert store.load_latest()[0].loc[0, 'ERA'] == '1.90'
+
+    def test_empty_store_returns_nothing(self, tmp_path):
+        assert SnapshotStore(tmp_path / 'missing').load_latest() == (None, None)
+
+
+class TestSnapshotStartup:
+    """Test cases for snapshot-backed startup and offline mode."""
+
+    @patch('sheets.fetch_sheet_data')
+    def test_successful_fetch_is_snapshotted(self, mock_fetch):
+        mock_fetch.return_value = sample_frame()
+        data_cache.get_sheet_data()
+        assert len(data_cache.snapshot_store.list_snapshots()) == 1
+
+    @patch('sheets.fetch_sheet_data')
+    def test_cold_start_serves_latest_snapshot(self, mock_fetch):
+        data_cache.snapshot_store.save(sample_frame('1.90'))
+        mock_fetch.return_value = None
+
+        data = data_cache.get_sheet_data()
+
+        assert data.loc[0, 'ERA'] == '1.90'
+
+    @patch('sheets.fetch_sheet_data')
+    def test_offline_mode_never_calls_google(self, mock_fetch, monkeypatch):
+        data_cache.snapshot_store.save(sample_frame())
+        monkeypatch.setenv('OFFLINE_MODE', '1')
+        data_cache.invalidate_sheet_data()
+
+        data = data_cache.sheet_cache.get()
+
+        assert data is not None
+        mock_fetch.assert_not_called()
+
+
+class TestChunkedDataset:
+    """Test cases for streaming a large range into a Parquet dataset."""
+
+    def make_client(self, rows=None):
+        rows = rows or [['Pitch', 'Velo', 'Spin%', 'Count']] + [
+            ['FB', '91.5', '50%', '1'], ['SL', '82.0', '40%', '2'], ['CH', '84.1', '30%', '3'],
+            ['FB', 'n/a', '45%', '4'], ['CB', '76.3', '', '5'],
+        ]
+        client = MagicMock()
+        client.get_grid_properties.return_value = {'Pitches': (len(rows), len(rows[0]))}
+        client.get_values.side_effect = lambda _id, range_name: {'values': rows[slice(*self.bounds(range_name))]}
+        return client
+
+    @staticmethod
+    def bounds(range_name):
+        first, last = range_name.split('!')[1].split(':')
+        return int(first[1:]) - 1, int(last[1:])
+
+    def test_chunks_written_with_first_chunk_schema(self, tmp_path):
+        client = self.make_client()
+        path = tmp_path / 'pitches.parquet'
+
+        rows = ingest_range_to_dataset('sheet-id', 'Pitches!A1:D2', str(path), client=client, chunk_rows=2)
+        data = read_dataset(str(path))
+
+        assert rows == 5 and client.get_values.call_count == 3
+        assert data['Pitch'].tolist() == ['FB', 'SL', 'CH', 'FB', 'CB']
+        assert data['Velo'].dtype == 'float32' and np.isnan(data['Velo'][3])
+        assert data['Count'].tolist() == [1, 2, 3, 4, 5]
+        assert data.attrs['percent_columns'] == ['Spin%']
+        assert not list(tmp_path.glob('*.tmp'))
+
+    def test_later_decimals_in_whole_number_column_are_kept(self, tmp_path):
+        rows = [['Pitch', 'IP', 'Ext']] + [
+            ['FB', '5', ''], ['SL', '6', ''], ['CH', '4.5', '6.1'], ['FB', '7', '5.9'],
+        ]
+        path = tmp_path / 'pitches.parquet'
+
+        ingest_range_to_dataset('sheet-id', 'Pitches!A1:C2', str(path), client=self.make_client(rows), chunk_rows=2)
+        data = read_dataset(str(path))
+
+        assert data['IP'].tolist() == [5, 6, 4.5, 7]
+        assert data['Ext'].dtype == 'float32'
+        assert np.isnan(data['Ext'][:2]).all() and data['Ext'][2:].tolist() == pytest.approx([6.1, 5.9])
+
+    def test_explicit_kinds_fix_the_schema(self):
+        chunks = [[['Pitch', 'Count'], ['FB', '1']], [['SL', '2.5']]]
+
+        typed = list(iter_typed_chunks(chunks, kinds={'Pitch': 'text', 'Count': 'integer'}))
+
+        assert [str(chunk['Count'].dtype) for chunk in typed] == ['Int32', 'Int32']
+        assert typed[1]['Count'].isna().all()
+
+    def test_empty_range_writes_nothing(self, tmp_path):
+        client = MagicMock()
+        client.get_grid_properties.return_value = {}
+        client.get_values.return_value = {}
+        path = tmp_path / 'empty.parquet'
+        assert ingest_range_to_dataset('sheet-id', 'Pitches!A1:D2', str(path), client=client) is None
+        assert not path.exists()
@@ -0,0 +1,133 @@
+from unittest.mock import patch
+
+from summaries import SummaryCache, build_prompt, count_tokens, summary_key
+from tests.conftest import FakeClock
+
+
+class TestSummaryKey:
+    """Test cases for summary cache keys."""
+
+    def test_key_ignores_empty_cells_and_whitespace(self):
+        first = summary_key({'ERA': '2.50', 'K%': '32.0%', 'Notes': ''}, 'gpt-4')
+        second = summary_key({'ERA': ' 2.50 ', 'K%': '32.0%'}, 'gpt-4')
+        assert first == second
+
+    def test_key_changes_with_staff_percentiles(self):
+        stats = {'Column_B': 'John Doe', 'ERA': '2.50'}
+        # A teammate's update moves this player's percentile without touching their stats
+        assert summary_key(stats, 'gpt-4', {'ERA': 40.0}) != summary_key(stats, 'gpt-4', {'ERA': 60.0})
+        assert summary_key(stats, 'gpt-4', {'ERA': 40.0}) != summary_key(stats, 'gpt-4')
+
+    def test_key_changes_with_model_stats_and_prompt(self):
+        stats = {'ERA': '2.50'}
+        assert summary_key(stats, 'gpt-4') != summary_key(stats, 'gpt-4o')
+        assert summary_key(stats, 'gpt-4') != summary_key({'ERA': '3.10'}, 'gpt-4')
+        assert summary_key(stats, 'gpt-4', prompt_version=1) != summary_key(stats, 'gpt-4', prompt_version=2)
+
+
+class TestBuildPrompt:
+    """Test cases for the compact stats prompt."""
+
+    def test_prompt_is_compact_and_in_sheet_order(self):
+        stats = {'Column_B': 'John Doe', 'Column_C': 'FB', 'ERA': '2.50', 'Notes': '',
+                 'K%': '32.0%', 'K%_1': '32.0%', 'WHIP': None}
+        prompt = build_prompt(stats)
+        assert 'Player: John Doe' in prompt
+        assert prompt.endswith('Stats:\nERA: 2.50\nK%: 32.0%')
+
+    def test_prompt_is_deterministic_and_annotates_percentiles(self):
+        stats = {'Column_B': 'John Doe', 'ERA': '2.50', 'K%': '32.0%'}
+        prompt = build_prompt(stats, {'ERA': 12.5})
+        assert prompt == build_prompt(dict(stats), {'ERA': 12.5})
+        assert 'ERA: 2.50 p12\nK%: 32.0%' in prompt
+
+    def test_prompt_is_smaller_than_dict_repr(self):
+        stats = {f'Stat {i}': '' for i in range(40)} | {'Column_B': 'John Doe', 'ERA': '2.50'}
+        assert count_tokens(build_prompt(stats)) < count_tokens(str(stats)) + count_tokens(build_prompt({}))
+
+
+class TestSummaryCache:
+    """Test cases for the persistent summary cache."""
+
+    def test_round_trip_persists_across_instances(self, tmp_path):
+        path = tmp_path / 'cache.sqlite3'
+        SummaryCache(path).put('John Doe', {'ERA': '2.50'}, 'gpt-4', 'Dealing.')
+        assert SummaryCache(path).get('John Doe', {'ERA': '2.50'}, 'gpt-4') == 'Dealing.'
+
+    def test_changed_stats_replace_old_summary(self, tmp_path):
+        cache = SummaryCache(tmp_path / 'cache.sqlite3')
+        cache.put('John Doe', {'ERA': '2.50'}, 'gpt-4', 'Dealing.')
+        assert cache.get('John Doe', {'ERA': '4.50'}, 'gpt-4') is None
+        cache.put('John Doe', {'ERA': '4.50'}, 'gpt-4', 'Struggling.')
+        assert len(cache) == 1
+
+    def test_entries_expire_after_ttl(self, tmp_path):
+        clock = FakeClock(1000.0)
+        cache = SummaryCache(tmp_path / 'cache.sqlite3', ttl_seconds=60, clock=clock)
+        cache.put('John Doe', {'ERA': '2.50'}, 'gpt-4', 'Dealing.')
+        clock.now += 61
+        assert cache.get('John Doe', {'ERA': '2.50'}, 'gpt-4') is None
+
+    def test_least_recently_used_entries_evicted(self, tmp_path):
+        clock = FakeClock(1000.0)
+        cache = SummaryCache(tmp_path / 'cache.sqlite3', max_entries=2, clock=clock)
+        for name in ['A', 'B']:
+            clock.now += 1
+            cache.put(name, {'Name': name}, 'gpt-4', f'{name} summary')
+        clock.now += 1
+        cache.get('A', {'Name': 'A'}, 'gpt-4')
+        clock.now += 1
+        cache.put('C', {'Name': 'C'}, 'gpt-4', 'C summary')
+        assert cache.get('B', {'Name': 'B'}, 'gpt-4') is None
+        assert cache.get('A', {'Name': 'A'}, 'gpt-4') == 'A summary'
+
+
+def test_player_page_uses_cached_summary():
+    import pandas as pd
+    from app import show_player_page
+    from summaries import summary_cache
+    from analytics import player_percentiles
+    df = pd.DataFrame({'Column_B': ['John Doe'], 'ERA': ['2.50']})
+    summary_cache.put('John Doe', {'Column_B': 'John Doe', 'ERA': '2.50'}, 'gpt-4', 'Cached summary.',
+                      player_percentiles(df, 'John Doe'))
+    with patch('streamlit.header'), \
+         patch('streamlit.subheader'), \
+         patch('streamlit.dataframe'), \
+         patch('streamlit.write') as mock_write, \
+         patch('views.player.generate_player_summary') as mock_generate:
+        show_player_page(df, 'Column_B', 'John Doe', 'sk-test', 'gpt-4')
+    mock_generate.assert_not_called()
+    mock_write.assert_called_once_with('Cached summary.')
+
+
+def test_player_page_streams_and_caches_summary():
+    import pandas as pd
+    from app import show_player_page
+    from summaries import summary_cache
+    df = pd.DataFrame({'Column_B': ['John Doe'], 'ERA': ['2.50']})
+    with patch('streamlit.header'), \
+         patch('streamlit.subheader'), \
+         patch('streamlit.dataframe'), \
+         patch('streamlit.write_stream', side_effect=lambda chunks: ''.join(chunks)) as mock_stream, \
+         patch('views.player.stream_player_summary', return_value=iter(['Sharp ', 'command.'])):
+        show_player_page(df, 'Column_B', 'John Doe', 'sk-test', 'gpt-4', stream=True)
+    from analytics import player_percentiles
+    mock_stream.assert_called_once()
+    percentiles = player_percentiles(df, 'John Doe')
+    assert summary_cache.get('John Doe', {'Column_B': 'John Doe', 'ERA': '2.50'}, 'gpt-4', percentiles) == 'Sharp command.'
+    # Without the percentiles the prompt differs, so the key does too
+    assert summary_cache.get('John Doe', {'Column_B': 'John Doe', 'ERA': '2.50'}, 'gpt-4') is None
+
+
+def test_stream_player_summary_yields_deltas():
+    from unittest.mock import MagicMock
+    from summaries import stream_player_summary
+
+    def chunk(text):
+        return MagicMock(choices=[MagicMock(delta=MagicMock(content=text))])
+
+    client = MagicMock()
+    client.chat.completions.create.return_value = iter([chunk('Sharp '), chunk(None), chunk('command.')])
+    with patch('summaries.openai_manager.get_client', return_value=client):
+        assert list(stream_player_summary({'ERA': '2.50'}, 'sk-test', 'gpt-4')) == ['Sharp ', 'command.']
+    assert client.chat.completions.create.call_args.kwargs['stream'] is True
@@ -0,0 +1,154 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+import sheets
+import summary_jobs
+from analytics import player_percentiles
+from openai_client import BREAKER_FAILURE_THRESHOLD, OpenAIClientManager
+from summaries import SummaryCache
+from summary_jobs import RateLimitGate, player_stats_rows, pregenerate_summaries
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Minimal chat completions endpoint; the first request is rate limited."""
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with self.server.lock:
+            self.server.requests.append(body)
+            rate_limited = len(self.server.requests) == 1
+        if rate_limited:
+            self.send_response(429)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            self.wfile.write(json.dumps({'error': {'message': 'Rate limit reached'}}).encode())
+            return
+        player_line = body['messages'][1]['content'].split('Player: ', 1)[1].split('\n', 1)[0]
+        payload = {
+            'id': 'chatcmpl-test', 'object': 'chat.completion', 'created': 0, 'model': body['model'],
+            'choices': [{
+                'index': 0, 'finish_reason': 'stop',
+                'message': {'role': 'assistant', 'content': f"Summary for {player_line}"},
+            }],
+        }
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(payload).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class FailingOpenAIHandler(BaseHTTPRequestHandler):
+    """Chat completions endpoint that is down: every request gets a 500."""
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self.rfile.read(int(self.headers['Content-Length']))
+        with self.server.lock:
+            self.server.requests.append(None)
+        self.send_response(500)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps({'error': {'message': 'Internal error'}}).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(handler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.requests = []
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+@pytest.fixture
+def fake_openai():
+    server = serve(FakeOpenAIHandler)
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def failing_openai():
+    server = serve(FailingOpenAIHandler)
+    yield server
+    server.shutdown()
+
+
+def roster():
+    return pd.DataFrame({
+        'Column_B': ['John Doe', 'Jane Smith', 'Staff Total:'],
+        'ERA': ['2.50', '3.10', '2.80'],
+    })
+
+
+def test_player_stats_rows_skip_totals():
+    assert [name for name, _ in player_stats_rows(roster())] == ['John Doe', 'Jane Smith']
+
+
+def test_pregenerate_against_fake_endpoint(fake_openai, tmp_path):
+    cache = SummaryCache(tmp_path / 'cache.sqlite3')
+    base_url = f"http://127.0.0.1:{fake_openai.server_address[1]}/v1"
+
+    outcomes = pregenerate_summaries(roster(), 'sk-test', 'gpt-4', max_workers=2, base_url=base_url, cache=cache)
+
+    assert outcomes['generated'] == 2 and not outcomes['failed']
+    assert len(fake_openai.requests) == 3  # one 429 retried
+    stats = dict(player_stats_rows(roster()))
+    percentiles = player_percentiles(roster(), 'John Doe')
+    assert 'John Doe' in cache.get('John Doe', stats['John Doe'], 'gpt-4', percentiles)
+
+    again = pregenerate_summaries(roster(), 'sk-test', 'gpt-4', base_url=base_url, cache=cache)
+    assert again['cached'] == 2
+    assert len(fake_openai.requests) == 3
+
+
+def test_pregenerate_uses_the_sheet_diff(fake_openai, tmp_path, monkeypatch):
+    cache = SummaryCache(tmp_path / 'cache.sqlite3')
+    cache.put('Old Timer', {'ERA': '5.00'}, 'gpt-4', 'Retired')
+    data = roster()
+    diff = sheets.SheetDiff(['Jane Smith'], ['Old Timer'], {}, ['Jane Smith'])
+    monkeypatch.setattr(sheets.sheet_sync, 'last_result', sheets.SyncResult(data, True, diff, None))
+    base_url = f"http://127.0.0.1:{fake_openai.server_address[1]}/v1"
+
+    pregenerate_summaries(data, 'sk-test', 'gpt-4', max_workers=1, base_url=base_url, cache=cache)
+
+    assert cache.get('Old Timer', {'ERA': '5.00'}, 'gpt-4') is None
+    players = [request['messages'][1]['content'].split('Player: ', 1)[1].split('\n', 1)[0]
+               for request in fake_openai.requests]
+    assert players[:2] == ['Jane Smith', 'Jane Smith']  # Changed player first (429 retried)
+
+
+def test_rate_limit_gate_pauses_all_callers():
+    sleeps = []
+    gate = RateLimitGate(sleep=sleeps.append, clock=lambda: 100.0)
+    gate.pause(5)
+    gate.wait()
+    assert sleeps == [5.0]
+
+
+def test_job_failures_open_the_shared_breaker(failing_openai, tmp_path, monkeypatch):
+    manager = OpenAIClientManager(sleep=lambda seconds: None)
+    monkeypatch.setattr(summary_jobs, 'openai_manager', manager)
+    base_url = f"http://127.0.0.1:{failing_openai.server_address[1]}/v1"
+    names = [f'Pitcher {i}' for i in range(BREAKER_FAILURE_THRESHOLD + 2)]
+    data = pd.DataFrame({'Column_B': names, 'ERA': ['2.50'] * len(names)})
+
+    outcomes = pregenerate_summaries(
+        data, 'sk-test', 'gpt-4', max_workers=1, base_url=base_url, cache=SummaryCache(tmp_path / 'cache.sqlite3'),
+    )
+
+    assert outcomes['failed'] == len(names)
+    assert manager.breaker('sk-test', base_url).is_open
+    # Once the breaker opens the remaining players fail fast without a request
+    assert len(failing_openai.requests) == BREAKER_FAILURE_THRESHOLD * manager.max_attempts
+    manager.reset()
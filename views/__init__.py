@@ -0,0 +1 @@
+# Dashboard pages; app.py imports each module the first time its page is shown
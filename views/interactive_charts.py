@@ -0,0 +1,110 @@
+# Interactive Charts page
+import plotly.io as pio
+import streamlit as st
+
+from analytics import get_analytics
+from charts import (
+    CHART_TYPES, DEFAULT_TREND_WEEKS, TREND_WEEKS, TRENDS, get_chart_data, get_figure_json, get_trend_cube,
+    get_trend_figure_json, trend_changes,
+)
+from players import get_registry
+
+
+def show_interactive_charts(data):
+    """Display the interactive charts page"""
+    st.subheader("📈 Interactive Baseball Charts")
+    st.markdown("Create custom visualizations with player names on hover")
+    
+    # Numeric columns are converted once per data version and shared across sessions
+    chart_data = get_chart_data(data)
+    
+    # Chart controls
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("**Select X-Axis:**")
+        columns = chart_data.plottable
+        x_axis = st.selectbox("X Axis", columns, key="chart_x_axis")
+    
+    with col2:
+        st.markdown("**Select Y-Axis:**")
+        y_axis = st.selectbox("Y Axis", columns, key="chart_y_axis")
+    
+    with col3:
+        st.markdown("**Chart Type:**")
+        chart_type = st.selectbox("Chart Type", CHART_TYPES, key="chart_type")
+    
+    if chart_type == TRENDS:
+        # Trends plot the Y-axis stat over past refreshes; the X-axis is the snapshot date
+        col1, col2 = st.columns(2)
+        with col1:
+            trend_players = st.multiselect(
+                "Players", get_registry(data).display_names, key="trend_players",
+                help="Leave empty to show the whole staff",
+            )
+        with col2:
+            trend_weeks = st.selectbox(
+                "Window", TREND_WEEKS, index=TREND_WEEKS.index(DEFAULT_TREND_WEEKS), key="trend_weeks",
+                format_func=lambda weeks: f"Last {weeks} weeks",
+            )
+    
+    st.markdown("---")
+    
+    # Get player name column (first text column)
+    player_name_col = chart_data.name_col
+    
+    if st.button("🚀 Generate Interactive Chart", type="primary"):
+        if chart_type == TRENDS:
+            show_trends(data, y_axis, tuple(trend_players), trend_weeks)
+            return
+
+        st.subheader(f"📊 {chart_type}: {x_axis} vs {y_axis}")
+        
+        try:
+            # Figures are cached per data version and chart parameters
+            figure_json = get_figure_json(data, x_axis, y_axis, chart_type)
+            
+            # Display the interactive chart
+            st.plotly_chart(pio.from_json(figure_json), use_container_width=True)
+            
+            # Add chart insights
+            st.markdown("### 📊 Chart Insights")
+            col1, col2 = st.columns(2)
+            
+            # Leaders among the staff (total rows excluded) come from the precomputed analytics
+            staff = get_analytics(data)
+            if y_axis in staff.highest.index:
+                best, worst = staff.highest[y_axis], staff.lowest[y_axis]
+                with col1:
+                    st.success(f"🏆 **Highest {y_axis}**: {chart_data.names[best] if player_name_col else 'Player'} ({chart_data.numeric.at[best, y_axis]:.2f})")
+                with col2:
+                    st.info(f"📊 **Lowest {y_axis}**: {chart_data.names[worst] if player_name_col else 'Player'} ({chart_data.numeric.at[worst, y_axis]:.2f})")
+                    
+        except Exception as e:
+            st.error(f"❌ Error creating chart: {str(e)}")
+            st.info("💡 Try selecting different columns or ensure the data is numeric for the selected chart type.")
+
+
+def show_trends(data, stat, players, weeks):
+    """Plot a stat over the recorded refreshes, with the biggest movers in the window."""
+    st.subheader(f"📊 {TRENDS}: {stat} over the last {weeks} weeks")
+    
+    try:
+        # Cubes and figures are cached per data version, players and window
+        figure_json = get_trend_figure_json(data, stat, players, weeks)
+        if figure_json is None:
+            st.info("📭 No history for this stat yet. Trends fill in as the sheet is refreshed over the season.")
+            return
+        st.plotly_chart(pio.from_json(figure_json), use_container_width=True)
+        
+        changes = trend_changes(get_trend_cube(data, stat, players, weeks), stat)
+        if len(changes) > 1:
+            st.markdown("### 📊 Trend Insights")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.success(f"📈 **Most improved {stat}**: {changes.index[0]} ({changes.iloc[0]:+.2f})")
+            with col2:
+                st.info(f"📉 **Biggest decline in {stat}**: {changes.index[-1]} ({changes.iloc[-1]:+.2f})")
+    
+    except Exception as e:
+        st.error(f"❌ Error creating chart: {str(e)}")
@@ -0,0 +1,188 @@
+# Page config, NJIT theme and sidebar shared by every page
+import streamlit as st
+
+from data_cache import request_refresh, sheet_cache
+
+PAGES = ["🏠 Team Overview", "📈 Interactive Charts"]
+
+# How often an open page checks whether the background loader swapped in new data
+DATA_POLL_SECONDS = 5
+
+# Custom CSS for NJIT colors (Navy and Red)
+THEME_CSS = """
+<style>
+    .main {
+        background: linear-gradient(135deg, #1e3a8a 0%, #1e40af 100%);
+        color: white;
+    }
+    
+    .stApp {
+        background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%);
+    }
+    
+    .stTitle {
+        color: #dc2626;
+        text-align: center;
+        font-size: 3rem;
+        text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
+        margin-bottom: 2rem;
+    }
+    
+    .stSubheader {
+        color: #ef4444;
+        border-bottom: 2px solid #dc2626;
+        padding-bottom: 0.5rem;
+    }
+    
+    .stSelectbox > div > div {
+        background-color: #1e40af;
+        color: white;
+        border: 2px solid #dc2626;
+    }
+    
+    .stButton > button {
+        background: linear-gradient(45deg, #dc2626, #ef4444);
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 0.5rem 2rem;
+        font-weight: bold;
+        transition: all 0.3s ease;
+        box-shadow: 0 4px 8px rgba(220, 38, 38, 0.3);
+    }
+    
+    .stButton > button:hover {
+        background: linear-gradient(45deg, #b91c1c, #dc2626);
+        transform: translateY(-2px);
+        box-shadow: 0 6px 12px rgba(220, 38, 38, 0.4);
+    }
+    
+    .stDataFrame {
+        border: 2px solid #dc2626;
+        border-radius: 10px;
+        overflow: hidden;
+    }
+    
+    .metric-container {
+        background: linear-gradient(135deg, #1e40af, #3b82f6);
+        padding: 1rem;
+        border-radius: 10px;
+        border: 2px solid #dc2626;
+        margin: 0.5rem 0;
+    }
+    
+    .stMetric {
+        background: transparent;
+    }
+    
+    h1 {
+        color: #dc2626 !important;
+        text-align: center;
+        text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
+    }
+    
+    .sidebar .sidebar-content {
+        background: linear-gradient(180deg, #1e40af, #1e3a8a);
+    }
+    
+    .stSidebar {
+        background: linear-gradient(180deg, #1e40af, #1e3a8a);
+    }
+</style>
+"""
+
+# Header with NJIT branding
+HEADER_HTML = """
+<div style="text-align: center; margin-bottom: 2rem;">
+    <h1 style="color: #dc2626; font-size: 3rem; text-shadow: 2px 2px 4px rgba(0,0,0,0.5);">
+        ⚾ NJIT Baseball Stats Dashboard ⚾
+    </h1>
+    <p style="color: #60a5fa; font-size: 1.2rem; margin-top: -1rem;">
+        🏆 Highlanders Baseball Analytics 🏆
+    </p>
+</div>
+"""
+
+
+def apply_theme():
+    """Set the page config and inject the NJIT styling and header."""
+    # NJIT-inspired styling
+    st.set_page_config(
+        page_title="NJIT Baseball Stats Dashboard", 
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(THEME_CSS, unsafe_allow_html=True)
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
+
+
+def render_sidebar():
+    """Draw the navigation and static sidebar content; return the selected page."""
+    # Create page navigation
+    st.sidebar.markdown("---")
+    page = st.sidebar.selectbox(
+        "📊 Navigate Dashboard",
+        PAGES,
+        key="page_selector"
+    )
+    st.sidebar.markdown("---")
+
+    # Sidebar with team info and controls
+    with st.sidebar:
+        st.markdown("""
+        <div style="text-align: center; margin-bottom: 1rem;">
+            <h2 style="color: #dc2626;">🏫 NJIT Highlanders</h2>
+            <p style="color: #60a5fa;">New Jersey Institute of Technology</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.markdown("---")
+
+        st.markdown("### 📊 Dashboard Controls")
+
+        # Data refresh button
+        if st.button("🔄 Refresh Data", type="secondary"):
+            request_refresh()
+            st.rerun()
+
+        st.markdown("---")
+
+        st.markdown("### ℹ️ About")
+        st.markdown("""
+        **Dashboard Features:**
+        - 📈 Live Google Sheets integration
+        - 📊 Interactive charts and graphs
+        - 📋 Real-time team statistics
+        - 🎨 NJIT-themed design
+
+        **Team Colors:**
+        - 🔵 Navy Blue
+        - 🔴 Red
+        """)
+
+        st.markdown("---")
+
+        st.markdown("### 🎯 Quick Stats")
+        st.info("📊 Stats will appear after data loads")
+
+        st.markdown("---")
+
+        st.markdown("""
+        <div style="text-align: center; color: #60a5fa; font-size: 0.8rem;">
+            Built with ❤️ for NJIT Baseball
+        </div>
+        """, unsafe_allow_html=True)
+    return page
+
+
+@st.fragment(run_every=DATA_POLL_SECONDS)
+def render_data_status(generation):
+    """Show whether data is refreshing; rerun the page once newer data has landed."""
+    if sheet_cache.generation != generation:
+        st.rerun(scope="app")
+    if sheet_cache.is_refreshing():
+        st.caption("🔄 Refreshing data in the background...")
+    else:
+        age = sheet_cache.age()
+        if age is not None:
+            st.caption(f"Data loaded {age / 60:.0f} min ago")
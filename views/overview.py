@@ -0,0 +1,50 @@
+# Team Overview page
+import streamlit as st
+
+from formatting import style_dataframe
+
+
+def show_team_overview(data):
+    """Display the main team overview page"""
+    # Display summary metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown('<div class="metric-container">', unsafe_allow_html=True)
+        st.metric("📊 Total Players", len(data))
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="metric-container">', unsafe_allow_html=True)
+        st.metric("📈 Data Columns", len(data.columns))
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown('<div class="metric-container">', unsafe_allow_html=True)
+        st.metric("🔄 Last Updated", "Live Data")
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown('<div class="metric-container">', unsafe_allow_html=True)
+        st.metric("⚾ Season", "2025")
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Data table section with conditional formatting
+    st.subheader("📋 Team Statistics")
+    
+    # Display the styled dataframe (colors computed per column with NumPy)
+    st.dataframe(style_dataframe(data), width=1200, height=400)
+    
+    # Add legend
+    st.markdown("""
+    **📊 Color Legend:**
+    - <span style="color: #22c55e; font-weight: bold;">🟢 Green Text</span>: Excellent performance (top 30% of the staff)
+    - <span style="color: #eab308; font-weight: bold;">🟡 Yellow Text</span>: Average/Good performance (middle 30%)
+    - <span style="color: #ef4444; font-weight: bold;">🔴 Red Text</span>: Needs improvement (bottom 40% of the staff)
+    - <span style="color: #60a5fa;">🔵 Blue Text</span>: Other stats and total rows
+    - <span style="color: #e5e7eb;">⚪ Gray Text</span>: Player info/Non-numeric
+    
+    Colors rank each player against the staff; for rates without a better direction (CSW, S%, Out%, ...) higher ranks higher.
+    """, unsafe_allow_html=True)
@@ -0,0 +1,59 @@
+# Player page with the AI summary
+import logging
+
+import pandas as pd
+import streamlit as st
+
+from analytics import player_percentiles
+from sheets import format_stats
+from summaries import generate_player_summary, is_error_summary, stream_player_summary, summary_cache
+
+
+def show_player_page(data, player_name_col, player_name, api_key, model_name, player_obj=None, stream=False):
+    st.header(f"Player: {player_name}")
+    stats_dict = None
+    if player_obj:
+        stats_dict = player_obj.stats
+        logging.info(f"Showing player page for {player_name}. Stats: {stats_dict}")
+    else:
+        player_row = data[data[player_name_col] == player_name]
+        if player_row.empty:
+            logging.warning(f"Player not found: {player_name}")
+            st.error("Player not found.")
+            return
+        stats_dict = player_row.iloc[0].to_dict()
+        logging.info(f"Showing player page for {player_name}. Stats: {stats_dict}")
+    # Typed stats are rendered back to sheet-style strings (e.g. '32.5%', IP '5.1')
+    stats_dict = format_stats(stats_dict, data)
+    st.subheader("Stats")
+    st.dataframe(pd.DataFrame([stats_dict]))
+    st.subheader("AI Summary")
+    if not api_key:
+        logging.warning("No OpenAI API key found.")
+        st.warning("No OpenAI API key found. Please set your API key in the .env file.")
+        st.info("AI summary cannot be generated without a valid API key.")
+        return
+    # Summaries are cached by (model, prompt version, prompt text with stats and staff percentiles),
+    # so players whose prompt is unchanged skip the API
+    percentiles = player_percentiles(data, player_name)
+    summary = summary_cache.get(player_name, stats_dict, model_name, percentiles)
+    if summary is not None:
+        st.write(summary)
+        return
+    if stream:
+        # Render tokens as they arrive instead of waiting for the whole completion
+        try:
+            summary = st.write_stream(stream_player_summary(stats_dict, api_key, model_name, percentiles))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.error(f"OpenAI API error: {e}")
+            summary = f"Error generating summary: {e}"
+    else:
+        with st.spinner("Generating AI summary..."):
+            summary = generate_player_summary(stats_dict, api_key, model_name, percentiles)
+        if not is_error_summary(summary):
+            st.write(summary)
+    if not is_error_summary(summary):
+        summary_cache.put(player_name, stats_dict, model_name, summary, percentiles)
+    else:
+        st.error("AI summary could not be generated. Please check your API key, network connection, or OpenAI account access.")
+        st.info("If you expected a summary, check app.log for details.")